@@ -223,6 +223,8 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     const sessionId = searchParams.get('sessionId');
     const expectedDrones = parseInt(searchParams.get('expectedDrones') || '0');
+    // Retorna sempre a posição triangulada (usado para registrar votos por drone no teste de carga)
+    const includeEstimate = searchParams.get('includeEstimate') === 'true';
 
     console.log(`[ANALYZE GET] SessionId: ${sessionId}, Expected: ${expectedDrones}`);
 
@@ -318,6 +320,17 @@ export async function GET(request: NextRequest) {
       }
     }
 
+    // Posição estimada usada pela votação ponderada, mesmo quando ela não foi aplicada.
+    // O tempo dessa triangulação extra é devolvido para ser descontado da latência
+    // medida pelo teste de carga.
+    let estimatedPosition: GeoPosition | null = calculatedPosition;
+    let estimateTime = 0;
+    if (includeEstimate && !estimatedPosition) {
+      const estimateStart = performance.now();
+      estimatedPosition = triangulateTDOA(droneDataArray);
+      estimateTime = performance.now() - estimateStart;
+    }
+
     // Limpa buffer da sessão
     audioBuffers.delete(sessionId);
 
@@ -332,6 +345,8 @@ export async function GET(request: NextRequest) {
       decisionMethod, // 'simple_majority', 'weighted_by_distance', ou 'simple_majority_fallback'
       weightedScore: useWeightedVote ? weightedScore : undefined,
       detectionRate: detectionRate,
+      estimatedPosition: includeEstimate ? estimatedPosition : undefined,
+      estimateTime: includeEstimate ? estimateTime : undefined, // ms
       classifications: classifications.map((c, i) => ({
         droneId: droneDataArray[i].droneId,
         isGunshot: c.isGunshot,
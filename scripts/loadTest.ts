@@ -17,6 +17,14 @@ interface TestConfig {
   numDrones: number;
   numTests: number;
   operationCenter: { lon: number; lat: number };
+  recordDrones: boolean; // Registra a classificação de cada drone
+}
+
+interface DroneVote {
+  droneId: string;
+  position: { lon: number; lat: number };
+  isGunshot: boolean;
+  confidence: number;
 }
 
 interface TestResult {
@@ -31,6 +39,8 @@ interface TestResult {
   positionError: number | null; // metros
   processingTime: number; // ms
   success: boolean;
+  droneVotes?: DroneVote[]; // Apenas com --record-drones
+  estimatedPosition?: { lon: number; lat: number } | null; // Posição usada na votação ponderada
 }
 
 interface TestSummary {
@@ -184,7 +194,8 @@ async function simulateSound(
 async function analyzeAudio(
   sessionId: string,
   droneAudioData: Array<{ droneId: string; audioData: string; position: { lon: number; lat: number } }>,
-  expectedDrones: number
+  expectedDrones: number,
+  includeEstimate: boolean = false
 ): Promise<any> {
   // Envia áudio de cada drone (simulando upload paralelo)
   const uploadPromises = droneAudioData.map(drone =>
@@ -212,7 +223,8 @@ async function analyzeAudio(
     await new Promise(resolve => setTimeout(resolve, pollInterval));
 
     const response = await fetch(
-      `http://localhost:3000/api/audio/analyze?sessionId=${sessionId}&expectedDrones=${expectedDrones}`
+      `http://localhost:3000/api/audio/analyze?sessionId=${sessionId}&expectedDrones=${expectedDrones}` +
+      (includeEstimate ? '&includeEstimate=true' : '')
     );
 
     const data = await response.json();
@@ -261,10 +273,13 @@ async function runSingleTest(
     const analysisData = await analyzeAudio(
       sessionId,
       simulateData.droneAudioData,
-      dronePositions.length
+      dronePositions.length,
+      config.recordDrones
     );
 
-    const processingTime = Date.now() - startTime;
+    // Desconta a triangulação extra feita só para --record-drones (estimateTime),
+    // para que a latência seja comparável com execuções sem o registro
+    const processingTime = Math.round(Date.now() - startTime - (analysisData.estimateTime ?? 0));
 
     // 5. Calcula erro de posição (se aplicável)
     let positionError: number | null = null;
@@ -275,6 +290,17 @@ async function runSingleTest(
     // 6. Verifica acerto na classificação
     const correctClassification = analysisData.isGunshot === (soundType === 'gunshot');
 
+    // 7. Registra voto de cada drone (para ajuste offline da votação ponderada)
+    let droneVotes: DroneVote[] | undefined;
+    if (config.recordDrones) {
+      droneVotes = analysisData.classifications.map((c: any) => ({
+        droneId: c.droneId,
+        position: dronePositions.find(d => d.droneId === c.droneId)!.position,
+        isGunshot: c.isGunshot,
+        confidence: c.confidence,
+      }));
+    }
+
     return {
       testId,
       radius: config.radius,
@@ -287,6 +313,8 @@ async function runSingleTest(
       positionError,
       processingTime,
       success: true,
+      droneVotes,
+      estimatedPosition: analysisData.estimatedPosition,
     };
 
   } catch (error) {
@@ -420,6 +448,35 @@ function saveResultsToCSV(results: TestResult[], summary: TestSummary, testDir:
   fs.appendFileSync(summaryPath, summaryCSV + '\n');
 }
 
+/**
+ * Salva a classificação de cada drone em CSV (uma linha por drone por teste)
+ * Usado por scripts/tune_weighted_vote.py para reproduzir a votação ponderada
+ */
+function saveDroneRecordsToCSV(results: TestResult[], radius: number, testDir: string) {
+  const rows = results
+    .filter(r => r.success && r.droneVotes)
+    .flatMap(r => r.droneVotes!.map(v => [
+      r.testId,
+      r.radius,
+      r.numDrones,
+      r.soundType,
+      v.droneId,
+      v.position.lat,
+      v.position.lon,
+      v.isGunshot,
+      v.confidence,
+      r.estimatedPosition?.lat ?? '',
+      r.estimatedPosition?.lon ?? '',
+    ].join(',')));
+
+  const dronesCSV = [
+    'testId,radius,numDrones,soundType,droneId,droneLat,droneLon,isGunshot,confidence,estLat,estLon',
+    ...rows,
+  ].join('\n');
+
+  fs.writeFileSync(path.join(testDir, `drones_radius_${radius}km.csv`), dronesCSV);
+}
+
 /**
  * Exibe progresso visual
  */
@@ -472,7 +529,8 @@ async function runTestBatch(
   operationCenter: { lon: number; lat: number },
   numTests: number,
   testDir: string,
-  maxConcurrent: number = 10 // Testes paralelos simultâneos
+  maxConcurrent: number = 10, // Testes paralelos simultâneos
+  recordDrones: boolean = false
 ): Promise<void> {
   // Calcula número de drones: e^(7.5*radius), mínimo 3, máximo 100
   const numDrones = Math.min(100, Math.max(3, Math.round(Math.exp(7.5 * radius))));
@@ -485,6 +543,7 @@ async function runTestBatch(
     numDrones,
     numTests,
     operationCenter,
+    recordDrones,
   };
   
   // Pré-gera IDs e tipos de som
@@ -511,6 +570,9 @@ async function runTestBatch(
   
   // Salva resultados
   saveResultsToCSV(results, summary, testDir);
+  if (recordDrones) {
+    saveDroneRecordsToCSV(results, radius, testDir);
+  }
   
   // Exibe resumo
   const totalTime = ((Date.now() - startTime) / 1000).toFixed(1);
@@ -524,18 +586,38 @@ async function runTestBatch(
   console.log(`   Tempo de Processamento: ${summary.processingTimeMean.toFixed(0)} ± ${summary.processingTimeStdDev.toFixed(0)} ms`);
 }
 
+/**
+ * Lê o orçamento de testes por raio gerado por plot_results.py --budget
+ */
+function loadTestBudget(budgetPath: string): Record<string, number> {
+  const budget = JSON.parse(fs.readFileSync(budgetPath, 'utf-8'));
+  const testsByRadius: Record<string, number> = {};
+
+  for (const [radius, entry] of Object.entries<any>(budget.radii)) {
+    testsByRadius[radius] = entry.recommendedTests;
+  }
+
+  return testsByRadius;
+}
+
 /**
  * Função principal
  */
 async function main() {
-  const args = process.argv.slice(2);
+  const argv = process.argv.slice(2);
+  const recordDrones = argv.includes('--record-drones');
+  const budgetIndex = argv.indexOf('--budget');
+  const budgetPath = budgetIndex >= 0 ? argv[budgetIndex + 1] : undefined;
+  const args = argv.filter((a, i) => !a.startsWith('--') && (budgetIndex < 0 || i !== budgetIndex + 1));
   
   if (args.length < 2) {
-    console.error('❌ Uso: ts-node scripts/loadTest.ts <longitude> <latitude> [maxConcurrent]');
+    console.error('❌ Uso: ts-node scripts/loadTest.ts <longitude> <latitude> [maxConcurrent] [--record-drones] [--budget <test_budget.json>]');
     console.error('   Exemplo: ts-node scripts/loadTest.ts -47.9292 -15.7801');
     console.error('   Exemplo: ts-node scripts/loadTest.ts -47.9292 -15.7801 20');
     console.error('');
     console.error('   maxConcurrent: Número de testes paralelos (padrão: 10)');
+    console.error('   --record-drones: Salva a classificação de cada drone (drones_radius_*.csv)');
+    console.error('   --budget: Testes por raio gerados por plot_results.py --budget (padrão: 1000 por raio)');
     process.exit(1);
   }
   
@@ -560,10 +642,19 @@ async function main() {
   const radiusTests = [0.1, 0.3, 0.5, 0.7, 0.9, 1.2]; // km
   const numTestsPerRadius = 1000;
   
+  // Orçamento por raio (raios ausentes usam numTestsPerRadius)
+  const testBudget = budgetPath ? loadTestBudget(budgetPath) : {};
+  const testsForRadius = (radius: number) => testBudget[String(radius)] ?? numTestsPerRadius;
+  const totalTests = radiusTests.reduce((sum, r) => sum + testsForRadius(r), 0);
+  
   console.log(`🧪 Configuração:`);
   console.log(`   Raios: ${radiusTests.join(', ')} km`);
-  console.log(`   Testes por raio: ${numTestsPerRadius}`);
-  console.log(`   Total de testes: ${radiusTests.length * numTestsPerRadius}`);
+  if (budgetPath) {
+    console.log(`   Testes por raio (${budgetPath}): ${radiusTests.map(r => `${r}km=${testsForRadius(r)}`).join(', ')}`);
+  } else {
+    console.log(`   Testes por raio: ${numTestsPerRadius}`);
+  }
+  console.log(`   Total de testes: ${totalTests}`);
   console.log(`   Distribuição: 70% disparo, 30% ambiente`);
   console.log(`   Paralelização: ${maxConcurrent} testes simultâneos\n`);
   
@@ -571,7 +662,7 @@ async function main() {
   
   // Executa testes para cada raio
   for (const radius of radiusTests) {
-    await runTestBatch(radius, operationCenter, numTestsPerRadius, testDir, maxConcurrent);
+    await runTestBatch(radius, operationCenter, testsForRadius(radius), testDir, maxConcurrent, recordDrones);
   }
   
   const totalTime = ((Date.now() - overallStartTime) / 1000 / 60).toFixed(2);
@@ -585,7 +676,9 @@ async function main() {
   try {
     const { execSync } = require('child_process');
     const summaryPath = path.join(testDir, 'summary.csv');
-    const plotCommand = `python3 scripts/plot_results.py "${summaryPath}"`;
+    // Usa o servidor de renderização se estiver rodando (plot_server.py),
+    // senão o cliente renderiza localmente
+    const plotCommand = `python3 scripts/plot_client.py "${summaryPath}"`;
     
     execSync(plotCommand, { 
       stdio: 'inherit',
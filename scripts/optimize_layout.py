@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Otimização do posicionamento dos drones para um erro de localização alvo.
+
+Hoje a quantidade de drones vem da regra e^(7.5*raio) e os drones são
+dispersos aleatoriamente (DRONE_CONFIG.MIN_DISTANCE, MAX_PLACEMENT_ATTEMPTS),
+sem considerar a geometria da localização. Este script avalia layouts
+candidatos com um mapa vetorizado de GDOP (Geometric Dilution of Precision)
+TDOA sobre uma grade densa da área de operação e, para cada raio, informa a
+menor quantidade de drones cujo erro previsto no percentil alvo atende à meta.
+
+Modelo:
+    Para uma fonte em p e drones s_i, com u_i = (p - s_i) / |p - s_i| e ruído
+    de tempo de chegada independente com peso w_i = (σ_toa / σ_i)², a matriz
+    de informação TDOA é
+        J = Σ w_i u_i u_iᵀ - (Σ w_i u_i)(Σ w_i u_i)ᵀ / Σ w_i
+    e o erro RMS previsto é c · σ_toa · sqrt(tr(J⁻¹)).
+    σ_toa: quantização do pico de energia (hop de 512 samples a 44100 Hz).
+    σ_i cresce com a distância seguindo a atenuação da simulação (1/d e
+    absorção atmosférica); sem esse termo o GDOP não depende da escala e
+    todos os raios teriam o mesmo erro.
+
+    O modelo descreve o limite de um solver TDOA ideal. Se o diretório tiver
+    summary.csv, o erro previsto é calibrado por um fator único para
+    reproduzir o erro médio observado com a regra atual.
+
+Layouts avaliados:
+    random     Dispersão atual (regra da rota /api/drone/position), referência
+    ring       Anel de raio α·R (melhor α)
+    grid       Grade quadrada recortada no círculo
+    optimized  Busca local em lote a partir do melhor anel ou grade
+
+Gera:
+1. layout_optimization.csv - erro previsto por raio, layout e quantidade de drones
+2. layout_optimization.npz - layouts escolhidos e mapas de erro (lido por plot_results.py)
+3. layout_error_maps.png  - mapas de erro previsto com os drones
+
+Uso:
+    python scripts/optimize_layout.py <diretorio_saida> [opções]
+
+Exemplo:
+    python scripts/optimize_layout.py tests/load_test_2025-11-05 --target-error 50 --percentile 95
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from simulate_captures import (ATMOSPHERIC_ABSORPTION, MIN_DISTANCE, SAMPLE_RATE,
+                               SPEED_OF_SOUND, drone_count_for_radius, scatter_drones)
+
+# Resolução do TOA na rota de análise: índice do frame de energia × hop
+HOP_SIZE = 512
+DEFAULT_TOA_SIGMA = HOP_SIZE / SAMPLE_RATE / np.sqrt(12)  # segundos
+
+# Distância até a qual o TOA fica no piso de quantização
+DEFAULT_SNR_DISTANCE = 100.0  # metros
+
+# Erro atribuído a pontos sem solução (geometria degenerada)
+DEGENERATE_ERROR = 1e6
+
+# Frações do raio testadas para o anel
+RING_FRACTIONS = (0.6, 0.8, 1.0)
+
+LAYOUTS = ['random', 'ring', 'grid', 'optimized']
+
+
+def grid_points(radius_m, size):
+    """
+    Pontos de uma grade quadrada dentro do círculo de operação.
+
+    Args:
+        radius_m: Raio de operação em metros
+        size: Pontos por eixo
+
+    Returns:
+        Tupla (pontos (G, 2) dentro do círculo, eixo 1D, máscara (size, size))
+    """
+    axis = np.linspace(-radius_m, radius_m, size)
+    xx, yy = np.meshgrid(axis, axis)
+    mask = np.hypot(xx, yy) <= radius_m
+    return np.stack([xx[mask], yy[mask]], axis=1), axis, mask
+
+
+def toa_weights(distances, snr_distance):
+    """
+    Peso relativo (1/σ²) do TOA de cada drone em função da distância.
+
+    O σ do TOA cresce com o inverso do SNR, que segue a atenuação da simulação
+    (1/d e absorção atmosférica); até snr_distance o σ fica no piso de quantização.
+
+    Args:
+        distances: Distâncias fonte-drone (m)
+        snr_distance: Distância (m) a partir da qual o SNR limita o TOA
+
+    Returns:
+        Array de pesos com o mesmo formato de distances
+    """
+    ratio = (distances / snr_distance
+             * np.exp(ATMOSPHERIC_ABSORPTION * (distances - snr_distance)))
+    return 1.0 / np.maximum(1.0, ratio) ** 2
+
+
+class ErrorModel:
+    """
+    Erro RMS previsto de localização TDOA (GDOP ponderado pelo SNR).
+
+    A matriz de informação é uma soma de termos por drone; `terms` devolve
+    esses termos para que a busca local atualize só o drone movido.
+    """
+
+    def __init__(self, range_sigma, snr_distance=DEFAULT_SNR_DISTANCE):
+        """
+        Args:
+            range_sigma: Desvio padrão da distância no piso do TOA (m) = c · σ_toa
+            snr_distance: Distância (m) a partir da qual o SNR limita o TOA
+        """
+        self.range_sigma = range_sigma
+        self.snr_distance = snr_distance
+
+    def terms(self, drones, points):
+        """
+        Termos por drone da matriz de informação em cada ponto.
+
+        Args:
+            drones: Posições (..., N, 2) em metros; NaN para drones ausentes
+            points: Pontos da grade (G, 2)
+
+        Returns:
+            Array (..., G, N, 6) com [w, w·ux, w·uy, w·ux², w·uy², w·ux·uy]
+        """
+        present = ~np.isnan(drones[..., None, :, 0])                      # (..., 1, N)
+        dx = points[:, None, 0] - np.nan_to_num(drones[..., None, :, 0])  # (..., G, N)
+        dy = points[:, None, 1] - np.nan_to_num(drones[..., None, :, 1])
+        dist = np.maximum(np.hypot(dx, dy), 1e-6)
+        ux, uy = dx / dist, dy / dist
+        w = toa_weights(dist, self.snr_distance) * present
+        return np.stack([w, w * ux, w * uy, w * ux * ux, w * uy * uy, w * ux * uy], axis=-1)
+
+    def error(self, totals):
+        """
+        Erro previsto a partir dos termos somados sobre os drones.
+
+        Args:
+            totals: Array (..., G, 6)
+
+        Returns:
+            Array (..., G) com o erro em metros
+        """
+        w, sx, sy, sxx, syy, sxy = np.moveaxis(totals, -1, 0)
+
+        # J = Σ w u uᵀ - (Σ w u)(Σ w u)ᵀ / Σ w
+        with np.errstate(divide='ignore', invalid='ignore'):
+            jxx = sxx - sx * sx / w
+            jyy = syy - sy * sy / w
+            jxy = sxy - sx * sy / w
+            det = jxx * jyy - jxy * jxy
+            error = self.range_sigma * np.sqrt((jxx + jyy) / det)
+        return np.where((det > 1e-12) & np.isfinite(error), error, DEGENERATE_ERROR)
+
+    def __call__(self, drones, points):
+        """Erro previsto (..., G) para layouts (..., N, 2)."""
+        return self.error(self.terms(drones, points).sum(axis=-2))
+
+
+def ring_layout(num_drones, radius_m, alpha):
+    """Drones igualmente espaçados em um anel de raio alpha·R."""
+    angle = 2 * np.pi * np.arange(num_drones) / num_drones
+    return alpha * radius_m * np.stack([np.cos(angle), np.sin(angle)], axis=1)
+
+
+def square_grid_layout(num_drones, radius_m):
+    """
+    Grade quadrada recortada no círculo com exatamente num_drones pontos.
+
+    O espaçamento é o maior que ainda comporta num_drones pontos; os pontos
+    excedentes mais próximos do centro são descartados para preservar a cobertura.
+    Retorna None se o espaçamento ficar abaixo de MIN_DISTANCE.
+    """
+    lo, hi = MIN_DISTANCE / 2, 2 * radius_m
+    for _ in range(50):
+        spacing = (lo + hi) / 2
+        half = np.arange(spacing / 2, radius_m, spacing)
+        axis = np.concatenate([-half[::-1], half])
+        xx, yy = np.meshgrid(axis, axis)
+        inside = np.hypot(xx, yy) <= radius_m
+        if inside.sum() >= num_drones:
+            lo = spacing
+        else:
+            hi = spacing
+
+    half = np.arange(lo / 2, radius_m, lo)
+    axis = np.concatenate([-half[::-1], half])
+    xx, yy = np.meshgrid(axis, axis)
+    inside = np.hypot(xx, yy) <= radius_m
+    points = np.stack([xx[inside], yy[inside]], axis=1)
+    if len(points) < num_drones or lo < MIN_DISTANCE:
+        return None
+
+    order = np.argsort(-np.hypot(points[:, 0], points[:, 1]), kind='stable')
+    return points[order[:num_drones]]
+
+
+def min_spacing_ok(drones):
+    """Verifica a distância mínima entre drones para um lote (K, N, 2)."""
+    diff = drones[:, :, None, :] - drones[:, None, :, :]
+    dist = np.linalg.norm(diff, axis=-1)
+    n = drones.shape[1]
+    dist[:, np.arange(n), np.arange(n)] = np.inf
+    return (dist >= MIN_DISTANCE).all(axis=(1, 2))
+
+
+def optimize_layout(start, radius_m, points, model, percentile, rng,
+                    iterations=150, batch=32):
+    """
+    Busca local em lote: a cada iteração avalia `batch` perturbações de um
+    drone simultaneamente e aceita a melhor se reduzir o erro no percentil.
+
+    Como cada candidato move um único drone, a informação de cada ponto é
+    atualizada trocando apenas o termo desse drone (O(batch·G) por iteração,
+    em vez de O(batch·G·N)).
+
+    Args:
+        start: Layout inicial (N, 2)
+        radius_m: Raio de operação (m)
+        points: Pontos da grade de avaliação (G, 2)
+        model: ErrorModel
+        percentile: Percentil do erro a minimizar
+        rng: Gerador numpy
+        iterations: Iterações
+        batch: Perturbações avaliadas por iteração
+
+    Returns:
+        Tupla (layout otimizado (N, 2), erro no percentil)
+    """
+    current = start.copy()
+    terms = model.terms(current, points)                                  # (G, N, 6)
+    totals = terms.sum(axis=1)
+    best = np.percentile(model.error(totals), percentile)
+    num_drones = len(current)
+
+    for it in range(iterations):
+        step = radius_m * (0.2 - 0.18 * it / iterations)
+        moved = rng.integers(0, num_drones, batch)
+        proposed = current[moved] + rng.normal(0, step, (batch, 2))
+
+        # Projeta de volta para dentro do círculo
+        norm = np.linalg.norm(proposed, axis=-1, keepdims=True)
+        proposed *= np.minimum(1.0, radius_m / np.maximum(norm, 1e-9))
+
+        new_terms = model.terms(proposed[:, None, :], points)[:, :, 0]   # (K, G, 6)
+        candidate_totals = totals + new_terms - terms[:, moved].swapaxes(0, 1)
+        scores = np.percentile(model.error(candidate_totals), percentile, axis=1)
+
+        spacing = np.linalg.norm(proposed[:, None, :] - current[None], axis=-1)
+        spacing[np.arange(batch), moved] = np.inf
+        scores[(spacing < MIN_DISTANCE).any(axis=1)] = np.inf
+
+        k = np.argmin(scores)
+        if scores[k] < best:
+            best = scores[k]
+            current[moved[k]] = proposed[k]
+            terms[:, moved[k]] = new_terms[k]
+            totals = terms.sum(axis=1)
+
+    return current, best
+
+
+def calibration_factor(summary_path, model, rng, grid_size=41, draws=8):
+    """
+    Fator de escala entre o erro médio observado e o previsto para a dispersão
+    aleatória atual, mediana entre os raios do summary.csv.
+
+    Args:
+        summary_path: Caminho do summary.csv
+        model: ErrorModel sem calibração
+        rng: Gerador numpy
+        grid_size: Pontos por eixo da grade
+        draws: Dispersões aleatórias por raio
+
+    Returns:
+        Fator (1.0 se não houver dados)
+    """
+    if not os.path.exists(summary_path):
+        return 1.0
+
+    df = pd.read_csv(summary_path, comment='#')
+    factors = []
+    for row in df.itertuples():
+        if not row.positionErrorMean > 0:
+            continue
+        radius_m = row.radius * 1000
+        points, _, _ = grid_points(radius_m, grid_size)
+        layouts = np.stack([scatter_drones(rng, int(row.numDrones), radius_m)
+                            for _ in range(draws)])
+        # Erros acima do raio não são distinguíveis de um chute no centro
+        predicted = np.minimum(model(layouts, points), radius_m).mean()
+        if predicted > 0:
+            factors.append(row.positionErrorMean / predicted)
+
+    return float(np.median(factors)) if factors else 1.0
+
+
+def best_ring(num_drones, radius_m, points, model, percentile):
+    """
+    Melhor anel (entre RING_FRACTIONS) que respeita MIN_DISTANCE.
+
+    Returns:
+        Tupla (layout, erro no percentil), ou None se nenhum anel couber
+    """
+    rings = [ring_layout(num_drones, radius_m, a) for a in RING_FRACTIONS]
+    rings = [r for r in rings if min_spacing_ok(r[None])[0]]
+    if not rings:
+        return None
+    scored = [(r, np.percentile(model(r, points), percentile)) for r in rings]
+    return min(scored, key=lambda s: s[1])
+
+
+def best_seed(num_drones, radius_m, points, model, percentile):
+    """Ponto de partida da otimização: o melhor entre anel e grade, ou None."""
+    seeds = []
+    ring = best_ring(num_drones, radius_m, points, model, percentile)
+    if ring is not None:
+        seeds.append(ring)
+    grid = square_grid_layout(num_drones, radius_m)
+    if grid is not None:
+        seeds.append((grid, np.percentile(model(grid, points), percentile)))
+    return min(seeds, key=lambda s: s[1])[0] if seeds else None
+
+
+def evaluate_radius(radius, target_error, percentile, model, rng,
+                    grid_size=81, search_size=31, max_drones=100, draws=8):
+    """
+    Avalia os layouts de um raio e encontra a menor quantidade de drones que
+    atende à meta para cada layout.
+
+    ring e grid são varridos em N crescente; optimized faz busca binária em N
+    até o melhor layout simples, otimizando a partir do melhor anel ou grade.
+
+    Args:
+        radius: Raio de operação (km)
+        target_error: Erro alvo (m)
+        percentile: Percentil do erro sobre a área
+        model: ErrorModel
+        rng: Gerador numpy
+        grid_size: Pontos por eixo da grade de avaliação
+        search_size: Pontos por eixo da grade usada na otimização
+        max_drones: Limite de drones (o mesmo da regra atual)
+        draws: Dispersões aleatórias da referência
+
+    Returns:
+        Tupla (linhas de resultado, layout escolhido (dict, vazio se nenhum))
+    """
+    radius_m = radius * 1000
+    points, axis, mask = grid_points(radius_m, grid_size)
+    search_points, _, _ = grid_points(radius_m, search_size)
+    rule_drones = drone_count_for_radius(radius)
+    p_col = f'p{percentile:g}Error'
+
+    rows = []
+
+    def record(name, num_drones, p_target, p50):
+        rows.append({'radius': radius, 'layout': name, 'numDrones': num_drones,
+                     'ruleDrones': rule_drones, p_col: p_target, 'p50Error': p50,
+                     'meetsTarget': bool(p_target is not None and p_target <= target_error)})
+
+    def evaluate(layout):
+        error = model(layout, points)
+        return np.percentile(error, percentile), np.percentile(error, 50)
+
+    # Referência: dispersão aleatória com a regra atual
+    layouts = np.stack([scatter_drones(rng, rule_drones, radius_m) for _ in range(draws)])
+    errors = model(layouts, points)
+    record('random', rule_drones,
+           np.percentile(errors, percentile, axis=1).mean(),
+           np.percentile(errors, 50, axis=1).mean())
+
+    # ring e grid: menor N que atende à meta
+    candidates = []
+    for name in ['ring', 'grid']:
+        for num_drones in range(3, max_drones + 1):
+            if name == 'ring':
+                ring = best_ring(num_drones, radius_m, points, model, percentile)
+                layout = None if ring is None else ring[0]
+            else:
+                layout = square_grid_layout(num_drones, radius_m)
+            if layout is None:
+                continue
+            p_target, p50 = evaluate(layout)
+            if p_target <= target_error:
+                record(name, num_drones, p_target, p50)
+                candidates.append((num_drones, p_target, name, layout))
+                break
+        else:
+            record(name, None, None, None)
+
+    # optimized: busca binária em N até o melhor layout simples
+    lo = 3
+    hi = min(candidates, key=lambda c: c[:2])[0] if candidates else max_drones
+    found = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        seed = best_seed(mid, radius_m, search_points, model, percentile)
+        if seed is None:
+            lo = mid + 1
+            continue
+        layout, _ = optimize_layout(seed, radius_m, search_points, model,
+                                    percentile, rng)
+        p_target, p50 = evaluate(layout)
+        if p_target <= target_error:
+            found = (mid, p_target, p50, layout)
+            hi = mid - 1
+        else:
+            lo = mid + 1
+
+    if found is not None:
+        num_drones, p_target, p50, layout = found
+        record('optimized', num_drones, p_target, p50)
+        candidates.append((num_drones, p_target, 'optimized', layout))
+    else:
+        record('optimized', None, None, None)
+
+    if not candidates:
+        return rows, {}
+
+    num_drones, p_target, name, layout = min(candidates, key=lambda c: c[:2])
+    error_map = np.full(mask.shape, np.nan)
+    error_map[mask] = model(layout, points)
+    chosen = {'radius': radius, 'layout': name, 'drones': layout,
+              'axis': axis, 'error_map': error_map, 'p_target': p_target}
+    return rows, chosen
+
+
+def save_layouts(chosen, output_dir, target_error, percentile):
+    """
+    Grava layout_optimization.npz (layouts escolhidos e mapas de erro).
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    arrays = {
+        'radii': np.array([c['radius'] for c in chosen]),
+        'layouts': np.array([c['layout'] for c in chosen]),
+        'p_target': np.array([c['p_target'] for c in chosen]),
+        'target_error': target_error,
+        'percentile': percentile,
+    }
+    for i, c in enumerate(chosen):
+        arrays[f'drones_{i}'] = c['drones']
+        arrays[f'axis_{i}'] = c['axis']
+        arrays[f'error_map_{i}'] = c['error_map']
+
+    output_path = os.path.join(output_dir, 'layout_optimization.npz')
+    np.savez_compressed(output_path, **arrays)
+    return output_path
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description='Otimiza o posicionamento dos drones com mapas de GDOP TDOA.')
+    parser.add_argument('output_dir', help='Diretório de saída (ex.: diretório do teste de carga)')
+    parser.add_argument('--radii', type=float, nargs='+', default=None,
+                        help='Raios em km (padrão: os do summary.csv ou os do teste de carga)')
+    parser.add_argument('--target-error', type=float, default=50.0,
+                        help='Erro de localização alvo em metros (padrão: 50)')
+    parser.add_argument('--percentile', type=float, default=95.0,
+                        help='Percentil do erro sobre a área (padrão: 95)')
+    parser.add_argument('--toa-sigma', type=float, default=DEFAULT_TOA_SIGMA * 1000,
+                        help='Piso do desvio padrão do tempo de chegada em ms '
+                             f'(padrão: {DEFAULT_TOA_SIGMA * 1000:.2f})')
+    parser.add_argument('--snr-distance', type=float, default=DEFAULT_SNR_DISTANCE,
+                        help='Distância (m) a partir da qual o SNR limita o TOA '
+                             f'(padrão: {DEFAULT_SNR_DISTANCE:g})')
+    parser.add_argument('--no-calibrate', action='store_true',
+                        help='Não calibra o erro previsto com o summary.csv')
+    parser.add_argument('--grid-size', type=int, default=81, help='Pontos por eixo da grade')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    summary_path = os.path.join(args.output_dir, 'summary.csv')
+
+    radii = args.radii
+    if radii is None and os.path.exists(summary_path):
+        radii = sorted(pd.read_csv(summary_path, comment='#')['radius'].unique())
+    if radii is None:
+        radii = [0.1, 0.3, 0.5, 0.7, 0.9, 1.2]
+
+    start = time.perf_counter()
+    range_sigma = SPEED_OF_SOUND * args.toa_sigma / 1000
+    factor = 1.0
+    if not args.no_calibrate:
+        factor = calibration_factor(summary_path, ErrorModel(range_sigma, args.snr_distance), rng)
+        range_sigma *= factor
+    model = ErrorModel(range_sigma, args.snr_distance)
+
+    print(f'\n📐 Otimização de layout: meta p{args.percentile:g} ≤ {args.target_error:g}m')
+    print(f'   σ_toa = {args.toa_sigma:.2f}ms | fator de calibração = {factor:.2f} '
+          f'| σ_distância = {range_sigma:.2f}m\n')
+
+    rows = []
+    chosen = []
+    for radius in radii:
+        radius_rows, radius_choice = evaluate_radius(
+            radius, args.target_error, args.percentile, model, rng,
+            grid_size=args.grid_size)
+        rows.extend(radius_rows)
+        if radius_choice:
+            chosen.append(radius_choice)
+
+        counts = {r['layout']: r['numDrones'] for r in radius_rows if r['meetsTarget']}
+        print(f'   Raio {radius}km: regra atual {radius_rows[0]["ruleDrones"]} drones | '
+              + ' | '.join(f'{name}: {counts.get(name, "-")}' for name in LAYOUTS[1:])
+              + f' → escolhido: {radius_choice.get("layout", "-")}')
+
+    print(f'\n⏱️  Otimização concluída em {time.perf_counter() - start:.2f}s')
+
+    results = pd.DataFrame(rows)
+    csv_path = os.path.join(args.output_dir, 'layout_optimization.csv')
+    results.to_csv(csv_path, index=False, float_format='%.4g')
+    print(f'✅ Resultados salvos: {csv_path}')
+
+    if not chosen:
+        print('⚠️  Nenhum layout atingiu a meta; mapas não serão gerados.')
+        sys.exit(0)
+
+    npz_path = save_layouts(chosen, args.output_dir, args.target_error, args.percentile)
+    print(f'✅ Layouts salvos: {npz_path}')
+
+    import plot_results
+    plot_results.plot_layout_maps(args.output_dir)
+
+
+if __name__ == '__main__':
+    main()
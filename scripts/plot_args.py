@@ -0,0 +1,62 @@
+"""
+Argumentos de linha de comando compartilhados por plot_results.py e plot_client.py.
+
+Não importa pandas nem matplotlib, para que o cliente continue leve e os dois
+scripts aceitem exatamente as mesmas opções.
+"""
+
+# Perfis de renderização (configuração em plot_results.PROFILES)
+PROFILE_NAMES = ('preview', 'publication')
+
+
+def add_render_arguments(parser):
+    """
+    Adiciona os caminhos dos summary.csv e o perfil de renderização.
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument('csv_paths', nargs='+', metavar='summary.csv',
+                        help='Caminho para o arquivo summary.csv')
+    parser.add_argument('--profile', choices=PROFILE_NAMES, default='publication',
+                        help='Perfil de renderização (padrão: publication)')
+
+
+def add_budget_arguments(parser):
+    """
+    Adiciona o modo --budget e os alvos de intervalo de confiança.
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    budget = parser.add_argument_group('orçamento de testes (--budget)')
+    budget.add_argument('--budget', action='store_true',
+                        help='Estima testes por raio em vez de gerar os gráficos')
+    budget.add_argument('--ci-accuracy', type=float, default=2.0,
+                        help='Semi-largura do IC da acurácia em pontos percentuais (padrão: 2.0)')
+    budget.add_argument('--ci-position', type=float, default=2.0,
+                        help='Semi-largura do IC do erro médio de posição em metros (padrão: 2.0)')
+    budget.add_argument('--ci-p95', type=float, default=250.0,
+                        help='Semi-largura do IC da latência p95 em ms (padrão: 250)')
+    budget.add_argument('--confidence', type=float, default=0.95,
+                        help='Nível de confiança (padrão: 0.95)')
+    budget.add_argument('--min-tests', type=int, default=100)
+    budget.add_argument('--max-tests', type=int, default=5000)
+
+
+def request_options(args):
+    """
+    Converte os argumentos em opções de plot_results.run_request (serializáveis
+    em JSON, para o pedido enviado ao servidor).
+
+    Args:
+        args: argparse.Namespace com os argumentos de render e de orçamento
+
+    Returns:
+        Dicionário {'profile': ...} ou {'budget': {...}}
+    """
+    if args.budget:
+        return {'budget': {'ci_accuracy': args.ci_accuracy, 'ci_position': args.ci_position,
+                           'ci_p95': args.ci_p95, 'confidence': args.confidence,
+                           'min_tests': args.min_tests, 'max_tests': args.max_tests}}
+    return {'profile': args.profile}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Cliente leve do serviço de renderização de relatórios (plot_server.py).
+
+Aceita os mesmos argumentos de plot_results.py (um ou mais summary.csv,
+--profile e o modo --budget, definidos em plot_args.py) e
+envia os pedidos ao daemon via socket Unix, que já está com pandas/matplotlib
+carregados. Se o daemon não estiver rodando, renderiza localmente chamando
+plot_results.py no próprio processo.
+
+Uso:
+    python scripts/plot_client.py <caminho_para_summary.csv> [...] [--profile preview] [--force]
+    python scripts/plot_client.py <caminho_para_summary.csv> [...] --budget [--ci-accuracy 2.0]
+
+Exemplo:
+    python scripts/plot_server.py serve &
+    python scripts/plot_client.py tests/load_test_2025-11-05/summary.csv
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+import plot_args
+
+# Socket padrão (pode ser sobrescrito pela variável PLOT_SERVER_SOCKET)
+DEFAULT_SOCKET = os.environ.get(
+    'PLOT_SERVER_SOCKET', f'/tmp/plot_server-{os.getuid()}.sock')
+
+
+def connect(socket_path=DEFAULT_SOCKET):
+    """
+    Conecta ao daemon de renderização.
+
+    Args:
+        socket_path: Caminho do socket Unix
+
+    Returns:
+        Socket conectado ou None se o daemon não estiver rodando
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send_request(sock, request):
+    """
+    Envia um pedido JSON ao daemon e itera sobre as respostas (uma por linha).
+
+    Args:
+        sock: Socket conectado
+        request: Dicionário do pedido
+
+    Yields:
+        Dicionários de resposta até a mensagem final {"done": true}
+    """
+    sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+    with sock.makefile('r', encoding='utf-8') as stream:
+        for line in stream:
+            message = json.loads(line)
+            if message.get('done'):
+                return
+            yield message
+
+
+def render_locally(csv_paths, options):
+    """
+    Renderiza sem daemon, no próprio processo (paga o custo de import).
+
+    Args:
+        csv_paths: Lista de summary.csv
+        options: Opções repassadas a plot_results.run_request
+
+    Returns:
+        True se todos os relatórios foram gerados
+    """
+    import plot_results
+    return all([plot_results.run_request(path, **options) for path in csv_paths])
+
+
+def main():
+    """Função principal."""
+    if len(sys.argv) < 2:
+        print('❌ Erro: Caminho do arquivo summary.csv não fornecido')
+        print('\nUso:')
+        print('  python scripts/plot_client.py <caminho_para_summary.csv> [...] [--profile preview] [--force]')
+        sys.exit(1)
+
+    # Mesmos argumentos de plot_results.py (plot_args.py), mais --force
+    parser = argparse.ArgumentParser(description='Cliente do servidor de renderização.')
+    plot_args.add_render_arguments(parser)
+    plot_args.add_budget_arguments(parser)
+    parser.add_argument('--force', action='store_true',
+                        help='Renderiza mesmo sem alterações nas entradas')
+    args = parser.parse_args()
+
+    csv_paths = [os.path.abspath(p) for p in args.csv_paths]
+    options = plot_args.request_options(args)
+
+    sock = connect()
+    if sock is None:
+        print('ℹ️  Servidor de renderização não encontrado, gerando localmente...')
+        sys.exit(0 if render_locally(csv_paths, options) else 1)
+
+    ok = True
+    with sock:
+        request = {'paths': csv_paths, 'options': options, 'force': args.force}
+        for result in send_request(sock, request):
+            if result.get('log'):
+                print(result['log'], end='')
+            if result['status'] == 'skipped':
+                print(f'⏭️  Sem alterações desde a última renderização: {result["path"]}')
+            elif result['status'] == 'error':
+                ok = False
+                print(f'❌ Falha ao renderizar {result["path"]} {result.get("message", "")}')
+            else:
+                print(f'⏱️  Renderizado em {result["seconds"]:.2f}s: {result["path"]}')
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
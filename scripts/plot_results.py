@@ -8,24 +8,45 @@ Gera gráficos de:
 3. Tempo de processamento por raio (com barras de erro)
 4. Dashboard combinado com todas as métricas
 5. Matriz de confusão (soundType vs detectedAsGunshot)
+6. Mapas de erro previsto dos layouts de drones (se optimize_layout.py
+   tiver gravado layout_optimization.npz no diretório)
+
+Modo de análise (--budget): em vez dos gráficos, estima a partir dos
+detailed_radius_*.csv quantos testes cada raio precisa para atingir as
+larguras de intervalo de confiança desejadas (acurácia, erro de posição e
+latência p95) e grava test_budget.json, usado por loadTest.ts --budget.
+
+Perfis de renderização (--profile):
+    publication  Padrão. Um arquivo PNG por gráfico, 300 DPI, bbox justo
+    preview      Visualização rápida durante ajustes: todos os painéis em uma
+                 única figura (preview.webp), DPI baixo, sem ajuste de bbox,
+                 artistas densos rasterizados e sem anotações por barra
 
 Uso:
-    python scripts/plot_results.py <caminho_para_summary.csv>
+    python scripts/plot_results.py <caminho_para_summary.csv> [--profile preview]
+    python scripts/plot_results.py <caminho_para_summary.csv> --budget [--ci-accuracy 2.0]
     
 Exemplo:
     python scripts/plot_results.py tests/load_test_2025-11-05/summary.csv
 """
 
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.ticker import MaxNLocator, FuncFormatter
 import numpy as np
 import sys
 import os
+import time
+import json
+import argparse
+from statistics import NormalDist
 from pathlib import Path
 from glob import glob
 
+import plot_args
+
 # Configuração de estilo acadêmico
 plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams.update({
@@ -64,6 +85,37 @@ plt.rcParams.update({
     'savefig.edgecolor': 'none',
 })
 
+# Perfis de renderização: rcParams aplicados durante a renderização; o preview
+# também define DPI e bbox da figura única (formato em preview_format)
+PROFILES = {
+    'publication': {
+        'rc': {},
+    },
+    'preview': {
+        'dpi': 100,
+        'bbox_inches': None,
+        'rc': {
+            'savefig.bbox': None,
+            'legend.shadow': False,
+            'legend.fancybox': False,
+            'path.simplify_threshold': 1.0,
+        },
+    },
+}
+
+
+def preview_format():
+    """
+    Formato de saída do perfil preview: WebP se suportado pelo Pillow, senão PNG.
+    """
+    try:
+        from PIL import features
+        if features.check('webp'):
+            return 'webp'
+    except ImportError:
+        pass
+    return 'png'
+
 
 def format_x_labels(radii, num_drones):
     """
@@ -503,15 +555,15 @@ def plot_combined_dashboard(df, output_dir):
     print(f'✅ Dashboard salvo: {os.path.join(output_dir, "dashboard_metrics.png")}')
 
 
-def plot_confusion_matrix(output_dir):
+def confusion_counts(output_dir):
     """
-    Gera matriz de confusão agregada de todos os raios testados.
-    
-    Lê todos os arquivos detailed_radius_*.csv e agrega as classificações
-    para criar uma matriz de confusão geral.
+    Agrega as classificações de todos os detailed_radius_*.csv.
     
     Args:
-        output_dir: Diretório contendo os arquivos CSV detalhados e onde salvar o gráfico
+        output_dir: Diretório contendo os arquivos CSV detalhados
+        
+    Returns:
+        Tupla (tp, tn, fp, fn) ou None se não houver dados
     """
     # Buscar todos os arquivos detailed_radius_*.csv
     pattern = os.path.join(output_dir, 'detailed_radius_*.csv')
@@ -520,7 +572,7 @@ def plot_confusion_matrix(output_dir):
     if not detailed_files:
         print(f'⚠️  Aviso: Nenhum arquivo detailed_radius_*.csv encontrado em {output_dir}')
         print('   Matriz de confusão não será gerada.')
-        return
+        return None
     
     print(f'\n📊 Gerando matriz de confusão...')
     print(f'   Arquivos encontrados: {len(detailed_files)}')
@@ -537,7 +589,7 @@ def plot_confusion_matrix(output_dir):
     
     if not all_data:
         print('❌ Erro: Não foi possível ler nenhum arquivo detalhado')
-        return
+        return None
     
     # Concatenar todos os dados
     df_all = pd.concat(all_data, ignore_index=True)
@@ -547,9 +599,8 @@ def plot_confusion_matrix(output_dir):
     
     if len(df_all) == 0:
         print('❌ Erro: Nenhum teste bem-sucedido encontrado')
-        return
+        return None
     
-    # Criar matriz de confusão
     # True Positive: soundType='gunshot' e detectedAsGunshot=True
     # True Negative: soundType='ambient' e detectedAsGunshot=False
     # False Positive: soundType='ambient' e detectedAsGunshot=True
@@ -560,6 +611,24 @@ def plot_confusion_matrix(output_dir):
     fp = len(df_all[(df_all['soundType'] == 'ambient') & (df_all['detectedAsGunshot'] == True)])
     fn = len(df_all[(df_all['soundType'] == 'gunshot') & (df_all['detectedAsGunshot'] == False)])
     
+    return tp, tn, fp, fn
+
+
+def plot_confusion_matrix(output_dir):
+    """
+    Gera matriz de confusão agregada de todos os raios testados.
+    
+    Lê todos os arquivos detailed_radius_*.csv e agrega as classificações
+    para criar uma matriz de confusão geral.
+    
+    Args:
+        output_dir: Diretório contendo os arquivos CSV detalhados e onde salvar o gráfico
+    """
+    counts = confusion_counts(output_dir)
+    if counts is None:
+        return
+    tp, tn, fp, fn = counts
+    
     # Matriz de confusão
     confusion_matrix = np.array([[tp, fn],
                                   [fp, tn]])
@@ -679,6 +748,392 @@ def plot_confusion_matrix(output_dir):
     print(f'   Acurácia: {accuracy:.2f}% | Precisão: {precision:.2f}% | Recall: {recall:.2f}%')
 
 
+def plot_preview(df, output_dir):
+    """
+    Perfil preview: todos os painéis (acurácia, erro, tempo e matriz de
+    confusão) em uma única figura, salva uma vez em baixa resolução.
+    
+    Args:
+        df: DataFrame com os dados
+        output_dir: Diretório contendo os CSVs detalhados e onde salvar o gráfico
+        
+    Returns:
+        Caminho do arquivo gerado
+    """
+    profile = PROFILES['preview']
+    fig = plt.figure(figsize=(16, 10))
+    gs = fig.add_gridspec(2, 2, hspace=0.45, wspace=0.25,
+                          top=0.92, bottom=0.08, left=0.06, right=0.97)
+    
+    x = np.arange(len(df))
+    width = 0.26
+    labels = format_x_labels(df['radius'], df['numDrones'])
+    colors = {
+        'geral': '#2C5F8D',
+        'disparo': '#C44536',
+        'ambiente': '#3A7D44'
+    }
+    
+    # (a) Acurácia
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.bar(x - width, df['accuracyMean'], width, label='Geral',
+            color=colors['geral'], rasterized=True)
+    ax1.bar(x, df['gunshotAccuracy'], width, label='Disparo',
+            color=colors['disparo'], rasterized=True)
+    ax1.bar(x + width, df['ambientAccuracy'], width, label='Ambiente',
+            color=colors['ambiente'], rasterized=True)
+    ax1.axhline(y=90, color='#666666', linestyle=':', linewidth=1.5)
+    ax1.set_ylim(0, 105)
+    ax1.set_ylabel('Acurácia (%)')
+    ax1.set_title('(a) Acurácia', loc='left')
+    ax1.legend(loc='lower left', ncol=3, fontsize=9)
+    
+    # (b) Erro de posição e (c) tempo de processamento
+    panels = [
+        (gs[0, 1], df['positionErrorMean'], df['positionErrorStdDev'],
+         colors['geral'], 'Erro de Posição (m)', '(b) Erro de Posição'),
+        (gs[1, 0], df['processingTimeMean'] / 1000, df['processingTimeStdDev'] / 1000,
+         colors['ambiente'], 'Tempo (s)', '(c) Tempo de Processamento'),
+    ]
+    for spec, mean, std, color, ylabel, title in panels:
+        ax = fig.add_subplot(spec)
+        bars = ax.bar(x, mean, yerr=std, capsize=3, color=color,
+                      error_kw={'linewidth': 1})
+        for artist in [*bars.patches, *bars.errorbar.lines[1], *bars.errorbar.lines[2]]:
+            artist.set_rasterized(True)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title, loc='left')
+    
+    for ax in fig.axes:
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, fontsize=8)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    
+    # (d) Matriz de confusão
+    ax4 = fig.add_subplot(gs[1, 1])
+    counts = confusion_counts(output_dir)
+    if counts is not None:
+        tp, tn, fp, fn = counts
+        matrix = np.array([[tp, fn], [fp, tn]])
+        total = matrix.sum()
+        ax4.imshow(matrix, cmap=plt.cm.Blues, alpha=0.8)
+        for i in range(2):
+            for j in range(2):
+                value = matrix[i, j]
+                ax4.text(j, i, f'{value:,}\n({value / total * 100:.1f}%)',
+                         ha='center', va='center', fontsize=11,
+                         color='white' if value > matrix.max() / 2 else 'black')
+        ax4.set_xticks([0, 1])
+        ax4.set_yticks([0, 1])
+        ax4.set_xticklabels(['Disparo', 'Ambiente'])
+        ax4.set_yticklabels(['Disparo', 'Ambiente'])
+        ax4.set_xlabel('Classe Predita')
+        ax4.set_ylabel('Classe Real')
+        ax4.grid(False)
+        accuracy = (tp + tn) / total * 100 if total > 0 else 0
+        ax4.set_title(f'(d) Matriz de Confusão (acurácia {accuracy:.2f}%)', loc='left')
+    else:
+        ax4.axis('off')
+    
+    fig.suptitle('Métricas de Desempenho (preview)', fontweight='bold', fontsize=14)
+    
+    file_format = preview_format()
+    output_path = os.path.join(output_dir, f'preview.{file_format}')
+    pil_kwargs = {'quality': 80, 'method': 0} if file_format == 'webp' else {'compress_level': 6}
+    fig.savefig(output_path, dpi=profile['dpi'], bbox_inches=profile['bbox_inches'],
+                format=file_format, facecolor='white', pil_kwargs=pil_kwargs)
+    plt.close(fig)
+    print(f'✅ Preview salvo: {output_path}')
+    return output_path
+
+
+def quantile_sparsity(values, q, delta=0.01):
+    """
+    Estima 1/f(x_q) (inverso da densidade no quantil q) por diferença finita
+    da função quantil empírica.
+    
+    Args:
+        values: Array de amostras
+        q: Quantil (ex.: 0.95)
+        delta: Passo da diferença finita
+        
+    Returns:
+        Estimativa de dQ/dq no quantil q
+    """
+    lo, hi = max(q - delta, 0.0), min(q + delta, 1.0)
+    return (np.quantile(values, hi) - np.quantile(values, lo)) / (hi - lo)
+
+
+def estimate_test_budget(output_dir, ci_accuracy=2.0, ci_position=2.0, ci_p95=250.0,
+                         confidence=0.95, min_tests=100, max_tests=5000):
+    """
+    Estima, por raio, quantos testes são necessários para atingir as
+    semi-larguras de intervalo de confiança desejadas.
+    
+    Estimativas baseadas na variância observada nos detailed_radius_*.csv:
+    - Acurácia (Bernoulli):   n = z² p(1-p) / h²
+    - Erro de posição médio:  n = (z s / h)², convertido para testes totais
+                              pela fração de testes com posição calculada
+    - Latência p95:           n = q(1-q) (z / (h f(x_q)))², com 1/f(x_q)
+                              estimado pela função quantil empírica
+    
+    Args:
+        output_dir: Diretório com os arquivos detailed_radius_*.csv
+        ci_accuracy: Semi-largura desejada para a acurácia (pontos percentuais)
+        ci_position: Semi-largura desejada para o erro médio de posição (m)
+        ci_p95: Semi-largura desejada para a latência p95 (ms)
+        confidence: Nível de confiança do intervalo
+        min_tests: Mínimo de testes recomendados por raio
+        max_tests: Máximo de testes recomendados por raio
+        
+    Returns:
+        DataFrame com uma linha por raio, ou None se não houver dados
+    """
+    detailed_files = glob(os.path.join(output_dir, 'detailed_radius_*.csv'))
+    if not detailed_files:
+        print(f'❌ Erro: Nenhum arquivo detailed_radius_*.csv encontrado em {output_dir}')
+        return None
+    
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    q = 0.95
+    rows = []
+    
+    for file_path in detailed_files:
+        try:
+            df = pd.read_csv(file_path)
+        except Exception as e:
+            print(f'⚠️  Erro ao ler {file_path}: {e}')
+            continue
+        
+        ok = df[df['success'] == True]
+        if len(ok) == 0:
+            continue
+        success_rate = len(ok) / len(df)
+        
+        # Acurácia
+        correct = ok['detectedAsGunshot'] == (ok['soundType'] == 'gunshot')
+        p = correct.mean()
+        n_accuracy = z ** 2 * p * (1 - p) / (ci_accuracy / 100) ** 2
+        half_accuracy = z * np.sqrt(p * (1 - p) / len(ok)) * 100
+        
+        # Erro de posição (apenas disparos com posição calculada)
+        errors = ok.loc[ok['soundType'] == 'gunshot', 'positionError'].dropna().to_numpy()
+        if len(errors) > 1:
+            std = errors.std(ddof=1)
+            position_rate = len(errors) / len(ok)
+            n_position = (z * std / ci_position) ** 2 / position_rate
+            half_position = z * std / np.sqrt(len(errors))
+        else:
+            n_position, half_position = np.nan, np.nan
+        
+        # Latência p95
+        times = ok['processingTime'].to_numpy(dtype=float)
+        sparsity = quantile_sparsity(times, q)
+        n_p95 = q * (1 - q) * (z * sparsity / ci_p95) ** 2
+        half_p95 = z * sparsity * np.sqrt(q * (1 - q) / len(times))
+        
+        needed = np.nanmax([n_accuracy, n_position, n_p95]) / success_rate
+        recommended = int(np.clip(np.ceil(needed), min_tests, max_tests))
+        
+        rows.append({
+            'radius': df['radius'].iloc[0],
+            'numDrones': int(df['numDrones'].iloc[0]),
+            'observedTests': len(df),
+            'accuracy': p * 100,
+            'accuracyHalfWidth': half_accuracy,
+            'testsForAccuracy': int(np.ceil(n_accuracy / success_rate)),
+            'positionErrorMean': errors.mean() if len(errors) else np.nan,
+            'positionHalfWidth': half_position,
+            'testsForPosition': (int(np.ceil(n_position / success_rate))
+                                 if np.isfinite(n_position) else None),
+            'p95Latency': np.quantile(times, q),
+            'p95HalfWidth': half_p95,
+            'testsForP95': int(np.ceil(n_p95 / success_rate)),
+            'recommendedTests': recommended,
+        })
+    
+    if not rows:
+        print('❌ Erro: Nenhum teste bem-sucedido encontrado')
+        return None
+    
+    return pd.DataFrame(rows).sort_values('radius').reset_index(drop=True)
+
+
+def write_test_budget(budget, output_dir, targets):
+    """
+    Grava test_budget.json (lido por loadTest.ts --budget).
+    
+    Args:
+        budget: DataFrame de estimate_test_budget
+        output_dir: Diretório de saída
+        targets: Dicionário com as semi-larguras e o nível de confiança usados
+        
+    Returns:
+        Caminho do arquivo gerado
+    """
+    radii = {}
+    for row in budget.to_dict('records'):
+        radii[f'{row["radius"]:g}'] = {
+            k: (None if isinstance(v, float) and not np.isfinite(v) else v)
+            for k, v in row.items() if k != 'radius'
+        }
+    
+    output_path = os.path.join(output_dir, 'test_budget.json')
+    with open(output_path, 'w') as f:
+        json.dump({'targets': targets, 'radii': radii}, f, indent=2, default=float)
+    return output_path
+
+
+def plot_test_budget(budget, output_dir):
+    """
+    Gráfico de testes executados vs recomendados por raio.
+    
+    Args:
+        budget: DataFrame de estimate_test_budget
+        output_dir: Diretório para salvar o gráfico
+    """
+    fig, ax = plt.subplots(figsize=(12, 7))
+    
+    x = np.arange(len(budget))
+    width = 0.38
+    
+    ax.bar(x - width / 2, budget['observedTests'], width,
+           label='Executados', color='#999999', alpha=0.85,
+           edgecolor='black', linewidth=1.2)
+    ax.bar(x + width / 2, budget['recommendedTests'], width,
+           label='Recomendados', color='#2C5F8D', alpha=0.85,
+           edgecolor='black', linewidth=1.2)
+    
+    ax.set_xlabel('Raio de Operação (km) e Quantidade de Drones', fontweight='bold', fontsize=12)
+    ax.set_ylabel('Testes por Raio', fontweight='bold', fontsize=12)
+    ax.set_title('Orçamento de Testes por Raio de Operação',
+                 fontweight='bold', fontsize=14, pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(format_x_labels(budget['radius'], budget['numDrones']), fontsize=10)
+    ax.grid(True, axis='y', alpha=0.4, linestyle='--', linewidth=0.8)
+    ax.grid(True, axis='x', alpha=0.2, linestyle='--', linewidth=0.6)
+    ax.set_axisbelow(True)
+    ax.legend(loc='upper left', frameon=True, shadow=True, fancybox=True)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'test_budget.png'),
+                dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f'✅ Gráfico salvo: {os.path.join(output_dir, "test_budget.png")}')
+
+
+def plot_layout_maps(output_dir):
+    """
+    Mapas de erro de localização previsto (GDOP TDOA) dos layouts escolhidos
+    por scripts/optimize_layout.py, um painel por raio.
+
+    Args:
+        output_dir: Diretório com layout_optimization.npz
+
+    Returns:
+        Caminho do gráfico gerado, ou None se não houver layouts
+    """
+    npz_path = os.path.join(output_dir, 'layout_optimization.npz')
+    if not os.path.exists(npz_path):
+        return None
+
+    data = np.load(npz_path)
+    radii = data['radii']
+    percentile = float(data['percentile'])
+    target_error = float(data['target_error'])
+
+    cols = min(3, len(radii))
+    rows = int(np.ceil(len(radii) / cols))
+    fig, axes = plt.subplots(rows, cols, figsize=(5.5 * cols, 5 * rows), squeeze=False,
+                             gridspec_kw={'wspace': 0.4, 'hspace': 0.35})
+
+    # Escala de cor comum, saturada em 2× a meta
+    vmax = 2 * target_error
+    for i, radius in enumerate(radii):
+        ax = axes.flat[i]
+        axis = data[f'axis_{i}']
+        drones = data[f'drones_{i}']
+        extent = [axis[0], axis[-1], axis[0], axis[-1]]
+
+        image = ax.imshow(data[f'error_map_{i}'], origin='lower', extent=extent,
+                          cmap='viridis', vmin=0, vmax=vmax, interpolation='bilinear')
+        ax.add_patch(plt.Circle((0, 0), radius * 1000, fill=False,
+                                edgecolor='black', linestyle='--', linewidth=1.2))
+        ax.scatter(drones[:, 0], drones[:, 1], marker='^', s=60, color='#C1403D',
+                   edgecolor='black', linewidth=0.8, zorder=3)
+
+        ax.set_title(f'{radius} km: {len(drones)} drones ({data["layouts"][i]})\n'
+                     f'p{percentile:g} = {data["p_target"][i]:.1f} m',
+                     fontweight='bold', fontsize=11)
+        ax.set_xlabel('x (m)', fontsize=10)
+        ax.set_ylabel('y (m)', fontsize=10)
+        ax.set_aspect('equal')
+
+    for ax in axes.flat[len(radii):]:
+        ax.set_visible(False)
+
+    fig.colorbar(image, ax=axes.ravel().tolist(), shrink=0.85,
+                 label='Erro de localização previsto (m)')
+    fig.suptitle(f'Layouts Mínimos para p{percentile:g} ≤ {target_error:g} m',
+                 fontweight='bold', fontsize=14)
+
+    output_path = os.path.join(output_dir, 'layout_error_maps.png')
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f'✅ Gráfico salvo: {output_path}')
+    return output_path
+
+
+def analyze_test_budget(csv_path, ci_accuracy=2.0, ci_position=2.0, ci_p95=250.0,
+                        confidence=0.95, min_tests=100, max_tests=5000):
+    """
+    Modo de análise: estima e grava o orçamento de testes por raio.
+    
+    Args:
+        csv_path: Caminho para o arquivo summary.csv (os detalhados ficam no mesmo diretório)
+        Demais argumentos: ver estimate_test_budget
+        
+    Returns:
+        True se o orçamento foi gerado, False em caso de erro
+    """
+    output_dir = os.path.dirname(csv_path)
+    print(f'\n📐 Estimando orçamento de testes em: {output_dir}')
+    print(f'   Alvos (±, {confidence * 100:.0f}% de confiança): acurácia {ci_accuracy}pp | '
+          f'erro de posição {ci_position}m | latência p95 {ci_p95}ms')
+    
+    budget = estimate_test_budget(output_dir, ci_accuracy, ci_position, ci_p95,
+                                  confidence, min_tests, max_tests)
+    if budget is None:
+        return False
+    
+    targets = {'accuracy': ci_accuracy, 'positionError': ci_position,
+               'p95Latency': ci_p95, 'confidence': confidence}
+    output_path = write_test_budget(budget, output_dir, targets)
+    plot_test_budget(budget, output_dir)
+    
+    print('\n' + '='*70)
+    print('📐 ORÇAMENTO DE TESTES POR RAIO')
+    print('='*70)
+    print(f'{"Raio":>8} {"Drones":>7} {"Exec.":>7} {"Acur.":>7} {"Posição":>8} {"p95":>7} {"Recom.":>8}')
+    for row in budget.itertuples():
+        position = '-' if row.testsForPosition is None or pd.isna(row.testsForPosition) \
+            else f'{int(row.testsForPosition)}'
+        print(f'{row.radius:>6.1f}km {row.numDrones:>7} {row.observedTests:>7} '
+              f'{row.testsForAccuracy:>7} {position:>8} {row.testsForP95:>7} '
+              f'{row.recommendedTests:>8}')
+    
+    saved = budget['observedTests'].sum() - budget['recommendedTests'].sum()
+    print(f'\n🧪 Total recomendado: {budget["recommendedTests"].sum()} '
+          f'(executados: {budget["observedTests"].sum()}, diferença: {-saved:+d})')
+    print('='*70 + '\n')
+    print(f'✅ Orçamento salvo: {output_path}')
+    print(f'   Use: npx tsx scripts/loadTest.ts <lon> <lat> [maxConcurrent] --budget {output_path}\n')
+    return True
+
+
 def print_summary_stats(df):
     """
     Imprime estatísticas resumidas dos testes.
@@ -713,22 +1168,21 @@ def print_summary_stats(df):
     print('='*70 + '\n')
 
 
-def main():
-    """Função principal."""
-    if len(sys.argv) < 2:
-        print('❌ Erro: Caminho do arquivo summary.csv não fornecido')
-        print('\nUso:')
-        print('  python scripts/plot_results.py <caminho_para_summary.csv>')
-        print('\nExemplo:')
-        print('  python scripts/plot_results.py tests/load_test_2025-11-05/summary.csv')
-        sys.exit(1)
-    
-    csv_path = sys.argv[1]
+def render_report(csv_path, profile='publication'):
+    """
+    Gera todos os gráficos e o resumo estatístico de um summary.csv.
     
+    Args:
+        csv_path: Caminho para o arquivo summary.csv
+        profile: Perfil de renderização ('publication' ou 'preview')
+        
+    Returns:
+        True se os gráficos foram gerados, False em caso de erro
+    """
     # Verificar se o arquivo existe
     if not os.path.exists(csv_path):
         print(f'❌ Erro: Arquivo não encontrado: {csv_path}')
-        sys.exit(1)
+        return False
     
     # Ler dados
     print(f'\n📂 Lendo dados de: {csv_path}')
@@ -736,7 +1190,7 @@ def main():
         df = pd.read_csv(csv_path, comment='#')
     except Exception as e:
         print(f'❌ Erro ao ler CSV: {e}')
-        sys.exit(1)
+        return False
     
     # Validar colunas necessárias
     required_cols = ['radius', 'numDrones', 'totalTests', 'accuracyMean', 
@@ -747,7 +1201,7 @@ def main():
     missing_cols = [col for col in required_cols if col not in df.columns]
     if missing_cols:
         print(f'❌ Erro: Colunas ausentes no CSV: {missing_cols}')
-        sys.exit(1)
+        return False
     
     # Ordenar por raio
     df = df.sort_values('radius').reset_index(drop=True)
@@ -757,25 +1211,125 @@ def main():
     
     print(f'📊 Gerando gráficos...')
     print(f'   Dados: {len(df)} raios diferentes')
+    print(f'   Perfil: {profile}')
     print(f'   Saída: {output_dir}\n')
     
+    start = time.perf_counter()
+    
     # Gerar gráficos
-    plot_accuracy(df, output_dir)
-    plot_position_error(df, output_dir)
-    plot_processing_time(df, output_dir)
-    plot_combined_dashboard(df, output_dir)
-    plot_confusion_matrix(output_dir)
+    with matplotlib.rc_context(PROFILES[profile]['rc']):
+        if profile == 'preview':
+            outputs = [os.path.basename(plot_preview(df, output_dir))]
+        else:
+            plot_accuracy(df, output_dir)
+            plot_position_error(df, output_dir)
+            plot_processing_time(df, output_dir)
+            plot_combined_dashboard(df, output_dir)
+            plot_confusion_matrix(output_dir)
+            outputs = ['accuracy_by_radius.png',
+                       'position_error_by_radius.png',
+                       'processing_time_by_radius.png',
+                       'dashboard_metrics.png',
+                       'confusion_matrix.png']
+            if plot_layout_maps(output_dir):
+                outputs.append('layout_error_maps.png')
+
+    elapsed = time.perf_counter() - start
     
     # Imprimir estatísticas
     print_summary_stats(df)
     
-    print('✅ Todos os gráficos foram gerados com sucesso!\n')
+    print(f'✅ Todos os gráficos foram gerados com sucesso! ({elapsed:.2f}s)\n')
     print(f'📁 Arquivos salvos em: {output_dir}/')
-    print('   - accuracy_by_radius.png')
-    print('   - position_error_by_radius.png')
-    print('   - processing_time_by_radius.png')
-    print('   - dashboard_metrics.png')
-    print('   - confusion_matrix.png\n')
+    for name in outputs:
+        print(f'   - {name}')
+    print()
+    return True
+
+
+def run_request(csv_path, profile='publication', budget=None):
+    """
+    Executa um pedido (linha de comando, plot_client.py ou plot_server.py).
+    
+    Args:
+        csv_path: Caminho para o arquivo summary.csv
+        profile: Perfil de renderização
+        budget: Alvos do modo --budget (argumentos de analyze_test_budget);
+                se informado, estima o orçamento em vez de gerar os gráficos
+        
+    Returns:
+        True em caso de sucesso
+    """
+    if budget is not None:
+        return analyze_test_budget(csv_path, **budget)
+    return render_report(csv_path, profile=profile)
+
+
+def request_outputs(csv_path, profile='publication', budget=None):
+    """
+    Arquivos que run_request pode gravar com as mesmas opções (a matriz de
+    confusão e os mapas de layout dependem dos dados do diretório).
+
+    Usado por plot_server.py para saber se um relatório já renderizado
+    continua no disco.
+
+    Args:
+        csv_path: Caminho para o arquivo summary.csv
+        profile: Perfil de renderização
+        budget: Alvos do modo --budget, ou None
+
+    Returns:
+        Lista de caminhos
+    """
+    output_dir = os.path.dirname(csv_path)
+    if budget is not None:
+        names = ['test_budget.json', 'test_budget.png']
+    elif profile == 'preview':
+        names = [f'preview.{preview_format()}']
+    else:
+        names = ['accuracy_by_radius.png',
+                 'position_error_by_radius.png',
+                 'processing_time_by_radius.png',
+                 'dashboard_metrics.png',
+                 'confusion_matrix.png',
+                 'layout_error_maps.png']
+    return [os.path.join(output_dir, name) for name in names]
+
+
+def parse_args(argv):
+    """
+    Lê os argumentos de linha de comando (definidos em plot_args.py, também
+    usados por plot_client.py).
+    
+    Args:
+        argv: Lista de argumentos (sem o nome do programa)
+        
+    Returns:
+        argparse.Namespace com csv_paths, profile e opções do modo --budget
+    """
+    parser = argparse.ArgumentParser(
+        description='Gera os gráficos dos testes de carga a partir do summary.csv.')
+    plot_args.add_render_arguments(parser)
+    
+    plot_args.add_budget_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main():
+    """Função principal."""
+    if len(sys.argv) < 2:
+        print('❌ Erro: Caminho do arquivo summary.csv não fornecido')
+        print('\nUso:')
+        print('  python scripts/plot_results.py <caminho_para_summary.csv> [--profile preview]')
+        print('\nExemplo:')
+        print('  python scripts/plot_results.py tests/load_test_2025-11-05/summary.csv')
+        sys.exit(1)
+    
+    args = parse_args(sys.argv[1:])
+    options = plot_args.request_options(args)
+    ok = [run_request(path, **options) for path in args.csv_paths]
+    if not all(ok):
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Serviço persistente de renderização dos relatórios de teste de carga.
+
+Mantém pandas, matplotlib e o estilo de plot_results.py carregados em um
+pool de processos, para que o custo de inicialização seja pago uma única vez
+por máquina e não a cada relatório. Os pedidos chegam via socket Unix
+(ver plot_client.py), são enfileirados por diretório de teste e renderizados
+em paralelo. Diretórios cujas entradas não mudaram desde a última
+renderização, e cujas saídas continuam como foram gravadas, são ignorados. Alterações em plot_results.py são recarregadas
+pelos processos do pool no próximo pedido, e o pool é recriado se um
+processo morrer (OOM, falha no backend gráfico).
+
+Uso:
+    python scripts/plot_server.py serve [--workers N] [--socket CAMINHO]
+    python scripts/plot_server.py stop [--socket CAMINHO]
+
+Exemplo:
+    python scripts/plot_server.py serve --workers 4 &
+    python scripts/plot_client.py tests/load_test_*/summary.csv
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from glob import glob
+
+from plot_client import DEFAULT_SOCKET, connect, send_request
+
+# Arquivo com a impressão digital das entradas da última execução de cada
+# conjunto de opções (perfis e modo --budget não invalidam uns aos outros)
+STATE_FILE = '.plot_state.json'
+
+
+def input_fingerprint(csv_path, options):
+    """
+    Calcula a impressão digital das entradas de um relatório.
+
+    Considera o summary.csv, os detailed_radius_*.csv e o
+    layout_optimization.npz do mesmo diretório, plot_results.py e
+    plot_args.py (que define as opções) e as opções de renderização.
+
+    Args:
+        csv_path: Caminho do summary.csv
+        options: Dicionário de opções de renderização
+
+    Returns:
+        Dicionário serializável em JSON
+    """
+    run_dir = os.path.dirname(csv_path)
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    inputs = [csv_path, os.path.join(scripts_dir, 'plot_results.py'),
+              os.path.join(scripts_dir, 'plot_args.py')]
+    inputs += sorted(glob(os.path.join(run_dir, 'detailed_radius_*.csv')))
+    inputs += glob(os.path.join(run_dir, 'layout_optimization.npz'))
+
+    files = {}
+    for path in inputs:
+        stat = os.stat(path)
+        files[os.path.basename(path)] = [stat.st_mtime_ns, stat.st_size]
+
+    return {'files': files, 'options': options}
+
+
+def output_snapshot(csv_path, options):
+    """
+    Estado das saídas de um pedido: [mtime, tamanho] por arquivo, ou None
+    para arquivos que não existem.
+
+    Args:
+        csv_path: Caminho do summary.csv
+        options: Dicionário de opções de renderização
+
+    Returns:
+        Dicionário serializável em JSON
+    """
+    snapshot = {}
+    for path in _load_plot_results().request_outputs(csv_path, **options):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            snapshot[os.path.basename(path)] = None
+            continue
+        snapshot[os.path.basename(path)] = [stat.st_mtime_ns, stat.st_size]
+    return snapshot
+
+
+def _state_key(fingerprint):
+    """Chave do estado: as opções do pedido, serializadas de forma estável."""
+    return json.dumps(fingerprint['options'], sort_keys=True)
+
+
+def _read_state(csv_path):
+    """Lê o estado do diretório ({chave das opções: impressão digital})."""
+    state_path = os.path.join(os.path.dirname(csv_path), STATE_FILE)
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def is_up_to_date(csv_path, fingerprint):
+    """
+    Verifica se o diretório já foi processado com as mesmas entradas e opções
+    e se as saídas gravadas não foram apagadas nem sobrescritas desde então.
+    """
+    entry = _read_state(csv_path).get(_state_key(fingerprint))
+    if not isinstance(entry, dict) or 'outputs' not in entry:
+        return False
+    recorded = {k: v for k, v in entry.items() if k != 'outputs'}
+    return (recorded == fingerprint
+            and entry['outputs'] == output_snapshot(csv_path, fingerprint['options']))
+
+
+def _load_plot_results():
+    """
+    Importa plot_results, recarregando-o se o arquivo mudou desde a carga.
+
+    Os processos do pool herdam o módulo já importado; sem o reload, uma
+    edição em plot_results.py mudaria a impressão digital mas o relatório
+    seria desenhado com o código antigo.
+    """
+    import plot_results
+    mtime = os.stat(plot_results.__file__).st_mtime_ns
+    if getattr(plot_results, '_loaded_mtime', mtime) != mtime:
+        plot_results = importlib.reload(plot_results)
+    plot_results._loaded_mtime = mtime
+    return plot_results
+
+
+def _warm_worker():
+    """Força a carga de plot_results (estilo e fontes) no processo do pool."""
+    _load_plot_results()
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.set_title('warm-up')
+    fig.canvas.draw()
+    plt.close(fig)
+    return os.getpid()
+
+
+def _render_job(csv_path, options):
+    """
+    Renderiza um relatório dentro de um processo do pool.
+
+    Args:
+        csv_path: Caminho do summary.csv
+        options: Opções repassadas a plot_results.run_request
+
+    Returns:
+        Tupla (sucesso, log capturado, segundos)
+    """
+    plot_results = _load_plot_results()
+
+    start = time.perf_counter()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            ok = plot_results.run_request(csv_path, **options)
+        except Exception as e:
+            print(f'❌ Erro: {e}')
+            ok = False
+    return ok, log.getvalue(), time.perf_counter() - start
+
+
+class RenderService:
+    """Fila de renderização sobre um pool de processos pré-aquecido."""
+
+    def __init__(self, workers):
+        """
+        Args:
+            workers: Quantidade de processos de renderização
+        """
+        # fork: os filhos herdam os módulos já importados pelo processo pai
+        _load_plot_results()
+
+        self.workers = workers
+        # RLock: add_done_callback chama _finish na hora se o job já terminou
+        self._lock = threading.RLock()
+        self._pool_lock = threading.Lock()
+        self._in_flight = {}
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        """Cria e aquece um pool de processos."""
+        context = multiprocessing.get_context('fork')
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        pids = set(f.result() for f in [pool.submit(_warm_worker) for _ in range(self.workers)])
+        print(f'🔥 Pool aquecido: {len(pids)} processo(s)')
+        return pool
+
+    def recover(self):
+        """
+        Recria o pool se ele estiver quebrado (um processo morreu).
+
+        Um ProcessPoolExecutor quebrado recusa qualquer novo job; sem isso o
+        daemon responderia erro a todos os pedidos até ser reiniciado.
+        """
+        with self._pool_lock:
+            try:
+                self.pool.submit(os.getpid).result()
+            except BrokenProcessPool:
+                print('⚠️  Processo de renderização morreu, recriando o pool...')
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._start_pool()
+
+    def _submit_job(self, csv_path, options):
+        """Envia um job ao pool, recriando-o se estiver quebrado."""
+        try:
+            return self.pool.submit(_render_job, csv_path, options)
+        except BrokenProcessPool:
+            self.recover()
+            return self.pool.submit(_render_job, csv_path, options)
+
+    def submit(self, csv_path, options, force=False):
+        """
+        Enfileira um relatório, reaproveitando pedidos idênticos em andamento.
+
+        Returns:
+            Future com o resultado de _render_job, ou None se não houve mudança
+        """
+        if not os.path.exists(csv_path):
+            return self._submit_job(csv_path, options)
+
+        fingerprint = input_fingerprint(csv_path, options)
+        if not force and is_up_to_date(csv_path, fingerprint):
+            return None
+
+        key = (csv_path, json.dumps(options, sort_keys=True))
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._submit_job(csv_path, options)
+                self._in_flight[key] = future
+                future.add_done_callback(
+                    lambda f: self._finish(key, csv_path, fingerprint, f))
+        return future
+
+    def _finish(self, key, csv_path, fingerprint, future):
+        """Registra a impressão digital e as saídas após uma renderização bem-sucedida."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if future.exception() is None and future.result()[0]:
+            with self._lock:
+                state = _read_state(csv_path)
+                state[_state_key(fingerprint)] = {
+                    **fingerprint, 'outputs': output_snapshot(csv_path, fingerprint['options'])}
+                state_path = os.path.join(os.path.dirname(csv_path), STATE_FILE)
+                with open(state_path, 'w') as f:
+                    json.dump(state, f)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Atende um pedido do cliente e devolve uma linha JSON por relatório."""
+
+    def reply(self, message):
+        self.wfile.write((json.dumps(message) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+
+        if request.get('command') == 'shutdown':
+            self.reply({'done': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        service = self.server.service
+        options = request.get('options', {})
+        jobs = [(path, service.submit(path, options, request.get('force', False)))
+                for path in request['paths']]
+
+        for path, future in jobs:
+            if future is None:
+                self.reply({'path': path, 'status': 'skipped'})
+                continue
+            try:
+                try:
+                    ok, log, seconds = future.result()
+                except BrokenProcessPool:
+                    # O processo morreu durante este job: recria o pool e tenta de novo
+                    service.recover()
+                    future = service.submit(path, options, force=True)
+                    ok, log, seconds = future.result()
+            except Exception as e:
+                self.reply({'path': path, 'status': 'error', 'message': str(e)})
+                continue
+            self.reply({'path': path, 'status': 'rendered' if ok else 'error',
+                        'log': log, 'seconds': seconds})
+
+        self.reply({'done': True})
+
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path, workers):
+    """
+    Inicia o daemon de renderização.
+
+    Args:
+        socket_path: Caminho do socket Unix
+        workers: Quantidade de processos de renderização
+    """
+    if os.path.exists(socket_path):
+        sock = connect(socket_path)
+        if sock is not None:
+            sock.close()
+            print(f'❌ Erro: Servidor já está rodando em {socket_path}')
+            sys.exit(1)
+        os.unlink(socket_path)
+
+    start = time.perf_counter()
+    service = RenderService(workers)
+    print(f'⏱️  Inicialização: {time.perf_counter() - start:.2f}s')
+
+    with RenderServer(socket_path, RequestHandler) as server:
+        server.service = service
+        print(f'🚀 Servidor de renderização ouvindo em {socket_path}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.shutdown()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+    print('👋 Servidor encerrado')
+
+
+def stop(socket_path):
+    """Solicita o encerramento do daemon."""
+    sock = connect(socket_path)
+    if sock is None:
+        print(f'ℹ️  Nenhum servidor rodando em {socket_path}')
+        return
+    with sock:
+        list(send_request(sock, {'command': 'shutdown'}))
+    print('✅ Servidor encerrado')
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description='Serviço persistente de renderização dos relatórios.')
+    parser.add_argument('command', choices=['serve', 'stop'])
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Caminho do socket Unix')
+    parser.add_argument('--workers', type=int, default=max(1, min(4, os.cpu_count() or 1)),
+                        help='Processos de renderização')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.socket, args.workers)
+    else:
+        stop(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Motor de síntese em lote das capturas de áudio dos drones.
+
+Reproduz, de forma vetorizada, a simulação de propagação feita por
+`simulateDroneAudioCapture` (lib/audioUtils.ts) para todos os drones de
+vários testes de uma vez, gerando um array float32 (testes × drones × samples):
+
+1. Atraso de propagação (distância / SPEED_OF_SOUND)
+2. Atenuação pela distância (inverso da distância + absorção atmosférica)
+3. Amplificação DRONE_AUDIO_GAIN
+4. Ruído uniforme com amplitude NOISE_LEVEL
+
+O atraso é aplicado em relação ao drone mais próximo da fonte em cada teste:
+a rota de análise só usa diferenças de tempo de chegada, e o padding absoluto
+(até 2R/c, ~308k samples a 1.2 km) dominaria o espaço em disco. O atraso
+absoluto de cada drone fica em `delays` no arquivo de geometria.
+
+As capturas são sintetizadas em blocos sobre um buffer fixo reutilizado e
+gravadas incrementalmente em disco (`.npy` mapeado em memória), permitindo
+classificação offline e geração de carga sem chamar as rotas HTTP de simulação.
+
+Uso:
+    python scripts/simulate_captures.py <diretorio_saida> [opções]
+
+Exemplo:
+    python scripts/simulate_captures.py tests/captures --radii 0.1 0.3 --tests 200 --seed 42
+"""
+
+import argparse
+import os
+import sys
+from glob import glob
+
+import numpy as np
+
+# Constantes espelhadas de lib/audioUtils.ts e lib/config.ts
+SAMPLE_RATE = 44100          # Hz
+SPEED_OF_SOUND = 343         # m/s a 20°C
+NOISE_LEVEL = 0.005
+DRONE_AUDIO_GAIN = 5.0
+REFERENCE_DISTANCE = 1.0     # metros
+ATMOSPHERIC_ABSORPTION = 0.001
+GUNSHOT_DURATION = 0.5       # segundos
+MIN_DISTANCE = 30            # metros (DRONE_CONFIG.MIN_DISTANCE)
+MAX_PLACEMENT_ATTEMPTS = 1000
+
+# Atraso gravado para drones que não puderam ser posicionados
+MISSING_DELAY = -1
+
+VALIDATION_PATH = os.path.join('database', 'validation')
+
+
+def drone_count_for_radius(radius):
+    """
+    Quantidade de drones usada pelo teste de carga: e^(7.5*raio), entre 3 e 100.
+
+    Args:
+        radius: Raio de operação em km
+
+    Returns:
+        Quantidade de drones
+    """
+    return int(min(100, max(3, round(np.exp(7.5 * radius)))))
+
+
+def read_wav_mono(path):
+    """
+    Lê um arquivo WAV e converte para float32 mono normalizado em [-1, 1].
+
+    Percorre os chunks RIFF (fmt e data) em vez de usar o módulo `wave`, que
+    não aceita IEEE float. Formatos: PCM 8/16/24/32 bits e IEEE float 32/64 bits
+    (inclusive WAVE_FORMAT_EXTENSIBLE), como wavBufferToFloat32Array.
+
+    Args:
+        path: Caminho do arquivo WAV
+
+    Returns:
+        Array float32 com as amostras
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if raw[:4] != b'RIFF' or raw[8:12] != b'WAVE':
+        raise ValueError('Arquivo não é um WAV RIFF')
+
+    fmt = None
+    frames = None
+    pos = 12
+    while pos + 8 <= len(raw):
+        chunk_id = raw[pos:pos + 4]
+        chunk_size = int.from_bytes(raw[pos + 4:pos + 8], 'little')
+        body = raw[pos + 8:pos + 8 + chunk_size]
+        if chunk_id == b'fmt ':
+            fmt = body
+        elif chunk_id == b'data':
+            frames = body
+        pos += 8 + chunk_size + (chunk_size & 1)
+
+    if fmt is None or frames is None:
+        raise ValueError('Chunks fmt/data ausentes')
+
+    audio_format = int.from_bytes(fmt[0:2], 'little')
+    num_channels = int.from_bytes(fmt[2:4], 'little')
+    bits = int.from_bytes(fmt[14:16], 'little')
+    if audio_format == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE: o formato real está no início do SubFormat
+        audio_format = int.from_bytes(fmt[24:26], 'little')
+
+    sample_width = bits // 8
+    frames = frames[:len(frames) - len(frames) % (sample_width * num_channels)]
+
+    if audio_format == 3 and bits in (32, 64):
+        data = np.frombuffer(frames, dtype=f'<f{sample_width}').astype(np.float32)
+    elif audio_format == 1 and bits == 8:
+        data = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+    elif audio_format == 1 and bits == 16:
+        data = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+    elif audio_format == 1 and bits == 24:
+        triples = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+        values = np.where(values >= 1 << 23, values - (1 << 24), values)
+        data = values.astype(np.float32) / 8388608.0
+    elif audio_format == 1 and bits == 32:
+        data = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f'Formato não suportado: audioFormat={audio_format}, {bits} bits')
+
+    return data.reshape(-1, num_channels).mean(axis=1).astype(np.float32)
+
+
+def synthetic_gunshot(rng, duration=GUNSHOT_DURATION):
+    """
+    Gera um disparo sintético (rajada de ruído com decaimento exponencial).
+
+    Usado quando o database de validação não está disponível.
+
+    Args:
+        rng: Gerador numpy
+        duration: Duração em segundos
+
+    Returns:
+        Array float32 com as amostras
+    """
+    t = np.arange(int(duration * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    burst = rng.uniform(-1.0, 1.0, t.size).astype(np.float32)
+    return (0.9 * burst * np.exp(-t / 0.05)).astype(np.float32)
+
+
+def load_source_bank(rng, audio_files=None):
+    """
+    Carrega os áudios de origem em um banco (arquivos × samples) com zero-padding.
+
+    Args:
+        rng: Gerador numpy (usado apenas para o disparo sintético)
+        audio_files: Lista de WAVs; se None, usa database/validation/gunshot_val_*.wav
+
+    Returns:
+        Tupla (banco float32, lista de nomes)
+
+    Raises:
+        ValueError: Se audio_files foi informado e nenhum arquivo pôde ser lido
+    """
+    explicit = audio_files is not None
+    if audio_files is None:
+        audio_files = sorted(glob(os.path.join(VALIDATION_PATH, 'gunshot_val_*.wav')))
+
+    sources = []
+    names = []
+    for path in audio_files:
+        try:
+            sources.append(read_wav_mono(path))
+            names.append(os.path.basename(path))
+        except Exception as e:
+            print(f'⚠️  Erro ao ler {path}: {e}')
+
+    if not sources and explicit:
+        raise ValueError(f'Nenhum dos {len(audio_files)} arquivo(s) de --audio pôde ser lido')
+
+    if not sources:
+        print('⚠️  Aviso: Nenhum áudio de disparo encontrado, usando disparo sintético')
+        sources = [synthetic_gunshot(rng)]
+        names = ['synthetic']
+
+    bank = np.zeros((len(sources), max(s.size for s in sources)), dtype=np.float32)
+    for i, s in enumerate(sources):
+        bank[i, :s.size] = s
+
+    return bank, names
+
+
+def scatter_drones(rng, num_drones, radius_m, min_distance=MIN_DISTANCE,
+                   max_attempts=MAX_PLACEMENT_ATTEMPTS):
+    """
+    Dispersa drones no círculo de operação sem sobreposição (mesma regra da rota
+    /api/drone/position), em coordenadas métricas locais.
+
+    Args:
+        rng: Gerador numpy
+        num_drones: Quantidade de drones
+        radius_m: Raio de operação em metros
+        min_distance: Distância mínima entre drones (m)
+        max_attempts: Tentativas por drone
+
+    Returns:
+        Array (num_drones, 2) com posições x, y em metros. Drones que não
+        puderam ser posicionados ficam com NaN (como na rota, que os descarta).
+    """
+    positions = np.full((num_drones, 2), np.nan)
+    placed = 0
+
+    for _ in range(num_drones):
+        # Sorteia todas as tentativas de uma vez e pega a primeira válida
+        angle = rng.uniform(0, 2 * np.pi, max_attempts)
+        r = np.sqrt(rng.random(max_attempts)) * radius_m
+        candidates = np.stack([r * np.cos(angle), r * np.sin(angle)], axis=1)
+
+        if placed > 0:
+            diff = candidates[:, None, :] - positions[None, :placed, :]
+            valid = (np.hypot(diff[..., 0], diff[..., 1]) >= min_distance).all(axis=1)
+        else:
+            valid = np.ones(max_attempts, dtype=bool)
+
+        hits = np.flatnonzero(valid)
+        if hits.size == 0:
+            continue
+        positions[placed] = candidates[hits[0]]
+        placed += 1
+
+    return positions
+
+
+class DroneCaptureEngine:
+    """
+    Sintetiza capturas de drones para blocos de testes em um buffer fixo.
+
+    O buffer de saída (chunk_size × num_drones × num_samples) é alocado uma
+    única vez e reutilizado a cada bloco; o atraso é aplicado na gravação
+    (write_shifted), sem materializar o padding em memória. Cada teste
+    tem seu próprio stream de RNG derivado da semente, de modo que o resultado
+    não depende do tamanho do bloco.
+    """
+
+    def __init__(self, num_drones, num_samples, chunk_size=8,
+                 noise_level=NOISE_LEVEL, gain=DRONE_AUDIO_GAIN):
+        """
+        Args:
+            num_drones: Drones por teste
+            num_samples: Samples do áudio de origem
+            chunk_size: Testes sintetizados por bloco
+            noise_level: Amplitude do ruído (NOISE_LEVEL)
+            gain: Amplificação (DRONE_AUDIO_GAIN)
+        """
+        self.num_drones = num_drones
+        self.num_samples = num_samples
+        self.chunk_size = chunk_size
+        self.noise_level = np.float32(noise_level)
+        self.gain = gain
+
+        self._buffer = np.empty((chunk_size, num_drones, num_samples), dtype=np.float32)
+
+    def delays(self, distances):
+        """
+        Atraso de propagação em samples para cada distância (m).
+
+        Drones ausentes (distância NaN) recebem MISSING_DELAY.
+        """
+        missing = np.isnan(distances)
+        delay = np.rint(np.where(missing, 0.0, distances) / SPEED_OF_SOUND * SAMPLE_RATE)
+        return np.where(missing, MISSING_DELAY, delay).astype(np.intp)
+
+    def relative_delays(self, distances):
+        """
+        Atraso em samples em relação ao drone mais próximo de cada teste.
+
+        Args:
+            distances: Distância fonte-drone (testes, num_drones), NaN para ausentes
+
+        Returns:
+            Array (testes, num_drones); MISSING_DELAY para drones ausentes
+        """
+        delays = self.delays(distances)
+        missing = delays == MISSING_DELAY
+        first = np.where(missing, np.iinfo(np.intp).max, delays).min(axis=1, keepdims=True)
+        return np.where(missing, MISSING_DELAY, delays - first)
+
+    def attenuation(self, distances):
+        """Ganho total (atenuação × absorção × amplificação) por distância (m)."""
+        effective = np.maximum(distances, REFERENCE_DISTANCE)
+        return (REFERENCE_DISTANCE / effective
+                * np.exp(-ATMOSPHERIC_ABSORPTION * distances)
+                * self.gain).astype(np.float32)
+
+    def synthesize(self, sources, distances, rngs):
+        """
+        Sintetiza as capturas de um bloco de testes.
+
+        Args:
+            sources: Áudio de origem por teste (n, num_samples)
+            distances: Distância fonte-drone (n, num_drones), NaN para drones ausentes
+            rngs: Lista de n geradores numpy (um stream por teste)
+
+        Returns:
+            View (n, num_drones, num_samples) do buffer interno, ainda sem o
+            atraso (ver write_shifted); é sobrescrita na próxima chamada.
+        """
+        n = len(sources)
+        out = self._buffer[:n]
+
+        missing = np.isnan(distances)
+        gain = self.attenuation(np.where(missing, 0.0, distances))
+        gain[missing] = 0.0
+
+        # Ruído uniforme em [-0.5, 0.5) × noise_level, um stream por teste
+        for i, rng in enumerate(rngs):
+            rng.random(out=out[i], dtype=np.float32)
+        out -= 0.5
+        out *= self.noise_level
+        out[missing] = 0.0
+
+        # sinal atenuado + ruído
+        out += sources[:, None, :] * gain[:, :, None]
+
+        return out
+
+    def write_shifted(self, captures, start, block, offsets):
+        """
+        Grava um bloco sintetizado deslocando cada drone pelo seu atraso.
+
+        O trecho antes do atraso e os drones ausentes ficam em zero, como em
+        simulateDroneAudioCapture; captures deve estar zerado (open_memmap w+).
+
+        Args:
+            captures: Array de saída (testes × drones × capture_length)
+            start: Índice do primeiro teste do bloco
+            block: Saída de synthesize (n, num_drones, num_samples)
+            offsets: Atrasos relativos do bloco (n, num_drones)
+        """
+        for i in range(len(block)):
+            for d in np.flatnonzero(offsets[i] != MISSING_DELAY):
+                begin = offsets[i, d]
+                captures[start + i, d, begin:begin + self.num_samples] = block[i, d]
+
+
+def simulate_radius(radius, num_tests, output_dir, bank, seed, chunk_size=8,
+                    noise_level=NOISE_LEVEL, gain=DRONE_AUDIO_GAIN):
+    """
+    Gera e grava as capturas de todos os testes de um raio.
+
+    Arquivos gerados em output_dir:
+      - captures_radius_{raio}km.npy: float32 (testes × drones × samples), com o
+        atraso relativo ao drone mais próximo
+      - geometry_radius_{raio}km.npz: posições, distâncias, atrasos absolutos e
+        relativos (samples, MISSING_DELAY para drones ausentes) e áudio usado
+
+    Args:
+        radius: Raio de operação em km
+        num_tests: Quantidade de testes
+        output_dir: Diretório de saída
+        bank: Banco de áudios de origem (arquivos × samples)
+        seed: Semente base
+        chunk_size: Testes por bloco
+        noise_level: Amplitude do ruído
+        gain: Amplificação dos drones
+    """
+    num_drones = drone_count_for_radius(radius)
+    radius_m = radius * 1000
+
+    # Streams independentes: geometria e um stream de ruído por teste
+    seq = np.random.SeedSequence([seed, int(round(radius * 1000))])
+    geometry_seq, *noise_seqs = seq.spawn(num_tests + 1)
+    geometry_rng = np.random.default_rng(geometry_seq)
+
+    drones = np.stack([scatter_drones(geometry_rng, num_drones, radius_m)
+                       for _ in range(num_tests)])
+    angle = geometry_rng.uniform(0, 2 * np.pi, num_tests)
+    r = np.sqrt(geometry_rng.random(num_tests)) * radius_m
+    sound = np.stack([r * np.cos(angle), r * np.sin(angle)], axis=1)
+    source_index = geometry_rng.integers(0, len(bank), num_tests)
+
+    distances = np.hypot(drones[..., 0] - sound[:, None, 0],
+                         drones[..., 1] - sound[:, None, 1])
+
+    engine = DroneCaptureEngine(num_drones, bank.shape[1],
+                                chunk_size=chunk_size, noise_level=noise_level, gain=gain)
+    offsets = engine.relative_delays(distances)
+    capture_length = engine.num_samples + max(0, int(offsets.max()))
+
+    captures_path = os.path.join(output_dir, f'captures_radius_{radius}km.npy')
+    captures = np.lib.format.open_memmap(
+        captures_path, mode='w+', dtype=np.float32,
+        shape=(num_tests, num_drones, capture_length))
+
+    for start in range(0, num_tests, chunk_size):
+        stop = min(start + chunk_size, num_tests)
+        rngs = [np.random.default_rng(s) for s in noise_seqs[start:stop]]
+        block = engine.synthesize(bank[source_index[start:stop]],
+                                  distances[start:stop], rngs)
+        engine.write_shifted(captures, start, block, offsets[start:stop])
+        print(f'\r   Raio {radius}km: {stop}/{num_tests} testes', end='')
+
+    captures.flush()
+    del captures
+    print()
+
+    geometry_path = os.path.join(output_dir, f'geometry_radius_{radius}km.npz')
+    np.savez(geometry_path,
+             drone_positions=drones,
+             sound_positions=sound,
+             distances=distances,
+             delays=engine.delays(distances),
+             relative_delays=offsets,
+             source_index=source_index,
+             sample_rate=SAMPLE_RATE)
+
+    print(f'✅ Capturas salvas: {captures_path} '
+          f'({num_tests} × {num_drones} × {capture_length})')
+    print(f'✅ Geometria salva: {geometry_path}')
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description='Sintetiza em lote as capturas de áudio dos drones.')
+    parser.add_argument('output_dir', help='Diretório de saída')
+    parser.add_argument('--radii', type=float, nargs='+',
+                        default=[0.1, 0.3, 0.5, 0.7, 0.9, 1.2], help='Raios em km')
+    parser.add_argument('--tests', type=int, default=100, help='Testes por raio')
+    parser.add_argument('--chunk-size', type=int, default=8, help='Testes por bloco')
+    parser.add_argument('--seed', type=int, default=0, help='Semente base do RNG')
+    parser.add_argument('--noise-level', type=float, default=NOISE_LEVEL)
+    parser.add_argument('--gain', type=float, default=DRONE_AUDIO_GAIN)
+    parser.add_argument('--audio', nargs='+', default=None,
+                        help='Arquivos WAV de origem (padrão: database/validation/gunshot_val_*.wav)')
+    args = parser.parse_args()
+
+    if args.tests <= 0 or args.chunk_size <= 0:
+        print('❌ Erro: --tests e --chunk-size devem ser positivos')
+        sys.exit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    try:
+        bank, names = load_source_bank(np.random.default_rng(args.seed), args.audio)
+    except ValueError as e:
+        print(f'❌ Erro: {e}')
+        sys.exit(1)
+    print(f'\n🔊 Áudios de origem: {len(names)} ({bank.shape[1]} samples)')
+    print(f'📁 Saída: {args.output_dir}\n')
+
+    for radius in args.radii:
+        simulate_radius(radius, args.tests, args.output_dir, bank, args.seed,
+                        chunk_size=args.chunk_size,
+                        noise_level=args.noise_level, gain=args.gain)
+
+    print('\n✅ Todas as capturas foram geradas com sucesso!\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Ajuste dos parâmetros da votação ponderada a partir das classificações por drone.
+
+Reproduz `weightedVoteDecision` da rota /api/audio/analyze para uma grade de
+pares (WEIGHTED_VOTE_THRESHOLD, DISTANCE_WEIGHT_DECAY) de uma só vez, com arrays
+NumPy em broadcast (testes × drones × grade), usando os arquivos
+drones_radius_*.csv gerados por `loadTest.ts --record-drones`.
+
+Regra reproduzida (por teste):
+    taxa = drones que detectaram disparo / total de drones
+    se taxa >= threshold e há posição estimada:
+        peso_i = exp(-decay × distância(drone_i, posição estimada))
+        disparo = Σ(peso_i × confiança_i × isGunshot_i) / Σ peso_i > 0.5
+    senão:
+        disparo = detecções >= ceil(total / 2)
+
+As grades sempre incluem os valores atuais (CURRENT_THRESHOLD, CURRENT_DECAY).
+Antes de gravar os resultados, uma amostra de testes é conferida contra uma
+reprodução escalar da rota (float64, teste a teste), incluindo o maior decay.
+
+Gera:
+1. weighted_vote_grid.csv - acurácia, precisão, recall e F1 por par e por raio
+2. weighted_vote_grid.png - superfícies de acurácia e F1 (todos os raios)
+
+Uso:
+    python scripts/tune_weighted_vote.py <diretorio_do_teste> [opções]
+
+Exemplo:
+    python scripts/tune_weighted_vote.py tests/load_test_2025-11-05 --decays 0.001 1 41
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from glob import glob
+
+import numpy as np
+import pandas as pd
+
+# Valores atuais em app/api/audio/analyze/route.ts
+CURRENT_THRESHOLD = 0.05
+CURRENT_DECAY = 0.1
+
+# Raio da Terra usado por calculateDistance na rota de análise
+EARTH_RADIUS = 6371000
+
+# Limite de memória do bloco de pesos (testes × drones × decays, float64) em bytes
+CHUNK_BYTES = 128 * 1024 * 1024
+
+# Testes sorteados para a conferência escalar
+VERIFY_TESTS = 200
+
+# Scores a esta distância de 0.5 podem cair de qualquer lado conforme a ordem
+# da soma (einsum × laço da rota) e não contam como divergência
+SCORE_TOLERANCE = 1e-12
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Distância Haversine vetorizada em metros.
+
+    Args:
+        lat1, lon1, lat2, lon2: Arrays em graus (com broadcast)
+
+    Returns:
+        Array de distâncias em metros
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def load_drone_records(run_dir):
+    """
+    Carrega e concatena os drones_radius_*.csv de um diretório de teste.
+
+    Args:
+        run_dir: Diretório do teste de carga
+
+    Returns:
+        DataFrame com uma linha por drone por teste, ou None se não houver arquivos
+    """
+    files = sorted(glob(os.path.join(run_dir, 'drones_radius_*.csv')))
+    if not files:
+        return None
+
+    frames = []
+    for file_path in files:
+        try:
+            frames.append(pd.read_csv(file_path))
+        except Exception as e:
+            print(f'⚠️  Erro ao ler {file_path}: {e}')
+
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_arrays(df):
+    """
+    Converte os registros em arrays densos (testes × drones) com máscara.
+
+    Args:
+        df: DataFrame de registros por drone
+
+    Returns:
+        Dicionário com radius, truth, has_estimate (T) e
+        votes, confidence, distance, mask (T × D)
+
+    As distâncias e confianças ficam em float64, como na rota: em float32,
+    exp(-decay × distância) zera para todos os drones já com decay × d ≳ 103
+    e a decisão passa a ser "não disparo".
+    """
+    df = df.sort_values(['radius', 'testId']).reset_index(drop=True)
+    test_index = df.groupby(['radius', 'testId'], sort=False).ngroup().to_numpy()
+    slot = df.groupby(['radius', 'testId'], sort=False).cumcount().to_numpy()
+
+    num_tests = test_index.max() + 1
+    max_drones = slot.max() + 1
+
+    def dense(values, fill, dtype):
+        out = np.full((num_tests, max_drones), fill, dtype=dtype)
+        out[test_index, slot] = values
+        return out
+
+    is_gunshot = df['isGunshot'].astype(str).str.lower() == 'true'
+    distance = haversine(df['droneLat'].to_numpy(), df['droneLon'].to_numpy(),
+                         df['estLat'].to_numpy(), df['estLon'].to_numpy())
+
+    first = np.unique(test_index, return_index=True)[1]
+    return {
+        'radius': df['radius'].to_numpy()[first],
+        'truth': (df['soundType'] == 'gunshot').to_numpy()[first],
+        'has_estimate': df['estLat'].notna().to_numpy()[first],
+        'votes': dense(is_gunshot.to_numpy(), False, bool),
+        'confidence': dense(df['confidence'].to_numpy(), 0.0, np.float64),
+        'distance': dense(np.nan_to_num(distance, nan=0.0), 0.0, np.float64),
+        'mask': dense(True, False, bool),
+    }
+
+
+def replay_decisions(votes, confidence, distance, mask, has_estimate, thresholds, decays):
+    """
+    Reproduz a decisão final para todos os testes e pares da grade.
+
+    Args:
+        votes, confidence, distance, mask: Arrays (T × D)
+        has_estimate: Array (T) indicando se houve triangulação
+        thresholds: Array (G1) de WEIGHTED_VOTE_THRESHOLD
+        decays: Array (G2) de DISTANCE_WEIGHT_DECAY
+
+    Returns:
+        Array booleano (T × G1 × G2) com a decisão "disparo"
+    """
+    num_drones = mask.sum(axis=1)
+    detections = (votes & mask).sum(axis=1)
+    rate = detections / np.maximum(num_drones, 1)
+    majority = detections >= np.ceil(num_drones / 2)
+
+    # Pesos por distância para todos os decays: (T × D × G2)
+    weights = np.exp(-distance[:, :, None] * decays[None, None, :])
+    weights *= mask[:, :, None]
+    score_num = np.einsum('td,tdg->tg', confidence * (votes & mask), weights)
+    score_den = weights.sum(axis=1)
+    score = np.divide(score_num, score_den, out=np.zeros_like(score_num), where=score_den > 0)
+    weighted = score > 0.5                                             # (T × G2)
+
+    use_weighted = (rate[:, None] >= thresholds[None, :]) & has_estimate[:, None]  # (T × G1)
+    return np.where(use_weighted[:, :, None], weighted[:, None, :], majority[:, None, None])
+
+
+def scalar_decision(votes, confidence, distance, has_estimate, threshold, decay):
+    """
+    Decisão de um teste, drone a drone, como weightedVoteDecision na rota.
+
+    Args:
+        votes, confidence, distance: Sequências com os drones do teste
+        has_estimate: Se houve triangulação
+        threshold: WEIGHTED_VOTE_THRESHOLD
+        decay: DISTANCE_WEIGHT_DECAY
+
+    Returns:
+        Tupla (True se o teste é classificado como disparo, score ponderado
+        ou None quando a decisão foi pelo voto simples)
+    """
+    detections = sum(votes)
+    if detections / max(len(votes), 1) >= threshold and has_estimate:
+        score = 0.0
+        total = 0.0
+        for vote, conf, dist in zip(votes, confidence, distance):
+            weight = math.exp(-decay * dist)
+            if vote:
+                score += weight * conf
+            total += weight
+        score = score / total if total > 0 else 0.0
+        return score > 0.5, score
+    return detections >= math.ceil(len(votes) / 2), None
+
+
+def verify_replay(arrays, thresholds, decays, rng, num_tests=VERIFY_TESTS):
+    """
+    Confere replay_decisions contra scalar_decision em uma amostra de testes.
+
+    Usa os extremos e os valores atuais da grade, o que inclui o maior
+    decay × distância (onde pesos em precisão simples zeram). Decisões com
+    score a até SCORE_TOLERANCE de 0.5 são contadas à parte como empates.
+
+    Returns:
+        Tupla (decisões divergentes, empates ignorados)
+    """
+    tests = rng.choice(len(arrays['truth']), min(num_tests, len(arrays['truth'])), replace=False)
+    thr = np.unique([thresholds[0], CURRENT_THRESHOLD, thresholds[-1]])
+    dec = np.unique([decays[0], CURRENT_DECAY, decays[-1]])
+
+    decision = replay_decisions(arrays['votes'][tests], arrays['confidence'][tests],
+                                arrays['distance'][tests], arrays['mask'][tests],
+                                arrays['has_estimate'][tests], thr, dec)
+
+    mismatches = 0
+    ties = 0
+    for row, t in enumerate(tests):
+        m = arrays['mask'][t]
+        for i, threshold in enumerate(thr):
+            for j, decay in enumerate(dec):
+                expected, score = scalar_decision(
+                    arrays['votes'][t][m], arrays['confidence'][t][m],
+                    arrays['distance'][t][m], arrays['has_estimate'][t], threshold, decay)
+                if decision[row, i, j] == expected:
+                    continue
+                if score is not None and abs(score - 0.5) <= SCORE_TOLERANCE:
+                    ties += 1
+                else:
+                    mismatches += 1
+    return mismatches, ties
+
+
+def with_value(grid, value):
+    """Insere value na grade ordenada, se ainda não houver um valor igual."""
+    if np.isclose(grid, value).any():
+        return np.where(np.isclose(grid, value), value, grid)
+    return np.union1d(grid, [value])
+
+
+def grid_metrics(arrays, thresholds, decays):
+    """
+    Calcula a matriz de confusão de cada par da grade, em blocos de testes.
+
+    Args:
+        arrays: Saída de build_arrays
+        thresholds: Array (G1)
+        decays: Array (G2)
+
+    Returns:
+        Dicionário com tp, fp, fn, tn (G1 × G2)
+    """
+    num_tests, max_drones = arrays['mask'].shape
+    chunk = max(1, CHUNK_BYTES // (max_drones * len(decays) * 8))
+
+    counts = {k: np.zeros((len(thresholds), len(decays)), dtype=np.int64)
+              for k in ('tp', 'fp', 'fn', 'tn')}
+
+    for start in range(0, num_tests, chunk):
+        sl = slice(start, start + chunk)
+        decision = replay_decisions(arrays['votes'][sl], arrays['confidence'][sl],
+                                    arrays['distance'][sl], arrays['mask'][sl],
+                                    arrays['has_estimate'][sl], thresholds, decays)
+        truth = arrays['truth'][sl]
+        positives = decision[truth].sum(axis=0)
+        negatives = decision[~truth].sum(axis=0)
+        counts['tp'] += positives
+        counts['fn'] += truth.sum() - positives
+        counts['fp'] += negatives
+        counts['tn'] += (~truth).sum() - negatives
+
+    return counts
+
+
+def metrics_frame(counts, thresholds, decays, radius_label):
+    """
+    Converte as contagens em DataFrame com acurácia, precisão, recall e F1 (%).
+    """
+    tp, fp, fn, tn = (counts[k].astype(float) for k in ('tp', 'fp', 'fn', 'tn'))
+    total = tp + fp + fn + tn
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = np.where(total > 0, (tp + tn) / total * 100, 0)
+        precision = np.where(tp + fp > 0, tp / (tp + fp) * 100, 0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn) * 100, 0)
+        f1 = np.where(precision + recall > 0,
+                      2 * precision * recall / (precision + recall), 0)
+
+    thr_grid, decay_grid = np.meshgrid(thresholds, decays, indexing='ij')
+    return pd.DataFrame({
+        'radius': radius_label,
+        'threshold': thr_grid.ravel(),
+        'decay': decay_grid.ravel(),
+        'accuracy': accuracy.ravel(),
+        'precision': precision.ravel(),
+        'recall': recall.ravel(),
+        'f1': f1.ravel(),
+    })
+
+
+def plot_surfaces(results, thresholds, decays, output_dir):
+    """
+    Gráfico das superfícies de acurácia e F1 (todos os raios).
+
+    Args:
+        results: DataFrame de métricas com radius == 'all'
+        thresholds: Array (G1)
+        decays: Array (G2)
+        output_dir: Diretório para salvar o gráfico
+    """
+    import matplotlib.pyplot as plt
+    import plot_results  # noqa: F401  (aplica o estilo acadêmico)
+
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+
+    for ax, metric, title in zip(axes, ['accuracy', 'f1'],
+                                 ['(a) Acurácia (%)', '(b) F1-Score (%)']):
+        surface = results[metric].to_numpy().reshape(len(thresholds), len(decays))
+        mesh = ax.pcolormesh(decays, thresholds * 100, surface,
+                             cmap='viridis', shading='nearest')
+        cbar = fig.colorbar(mesh, ax=ax)
+        cbar.set_label(title, rotation=270, labelpad=20, fontweight='bold')
+
+        best = results.loc[results[metric].idxmax()]
+        ax.plot(CURRENT_DECAY, CURRENT_THRESHOLD * 100, marker='o', color='white',
+                markeredgecolor='black', linestyle='none', label='Atual')
+        ax.plot(best['decay'], best['threshold'] * 100, marker='*', markersize=14,
+                color='#C44536', markeredgecolor='black', linestyle='none',
+                label=f'Melhor ({best[metric]:.2f}%)')
+
+        if decays.min() > 0:
+            ax.set_xscale('log')
+        ax.set_xlabel('DISTANCE_WEIGHT_DECAY (1/m)', fontweight='bold')
+        ax.set_ylabel('WEIGHTED_VOTE_THRESHOLD (%)', fontweight='bold')
+        ax.set_title(title, fontweight='bold', loc='left', pad=10)
+        ax.grid(False)
+        ax.legend(loc='upper right', frameon=True, fontsize=9)
+
+    fig.suptitle('Ajuste da Votação Ponderada por Distância',
+                 fontweight='bold', fontsize=15)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'weighted_vote_grid.png'),
+                dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f'✅ Gráfico salvo: {os.path.join(output_dir, "weighted_vote_grid.png")}')
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description='Grade de parâmetros da votação ponderada a partir de drones_radius_*.csv.')
+    parser.add_argument('run_dir', help='Diretório do teste de carga')
+    parser.add_argument('--thresholds', type=float, nargs=3, default=[0.0, 0.5, 51],
+                        metavar=('INICIO', 'FIM', 'N'), help='Grade linear do threshold')
+    parser.add_argument('--decays', type=float, nargs=3, default=[0.001, 1.0, 41],
+                        metavar=('INICIO', 'FIM', 'N'), help='Grade logarítmica do decay')
+    parser.add_argument('--no-plot', action='store_true', help='Não gera o gráfico')
+    args = parser.parse_args()
+
+    df = load_drone_records(args.run_dir)
+    if df is None:
+        print(f'❌ Erro: Nenhum arquivo drones_radius_*.csv encontrado em {args.run_dir}')
+        print('   Execute o teste de carga com --record-drones.')
+        sys.exit(1)
+
+    thresholds = with_value(
+        np.linspace(args.thresholds[0], args.thresholds[1], int(args.thresholds[2])),
+        CURRENT_THRESHOLD)
+    decays = with_value(
+        np.geomspace(args.decays[0], args.decays[1], int(args.decays[2])), CURRENT_DECAY)
+
+    start = time.perf_counter()
+    arrays = build_arrays(df)
+    print(f'\n📂 Registros: {len(df):,} drones em {len(arrays["truth"]):,} testes')
+    print(f'🔢 Grade: {len(thresholds)} thresholds × {len(decays)} decays')
+
+    mismatches, ties = verify_replay(arrays, thresholds, decays, np.random.default_rng(0))
+    if mismatches:
+        print(f'❌ Erro: {mismatches} decisões divergem da reprodução escalar da rota')
+        sys.exit(1)
+    if ties:
+        print(f'⚠️  Aviso: {ties} decisões com score = 0.5 (±{SCORE_TOLERANCE:g}) '
+              f'diferem só pela ordem da soma')
+    print('✅ Replay conferido com a reprodução escalar da rota')
+
+    frames = []
+    for radius in np.unique(arrays['radius']):
+        selected = arrays['radius'] == radius
+        subset = {k: v[selected] for k, v in arrays.items()}
+        frames.append(metrics_frame(grid_metrics(subset, thresholds, decays),
+                                    thresholds, decays, radius))
+    overall = metrics_frame(grid_metrics(arrays, thresholds, decays),
+                            thresholds, decays, 'all')
+    frames.append(overall)
+    print(f'⏱️  Grade avaliada em {time.perf_counter() - start:.2f}s')
+
+    results = pd.concat(frames, ignore_index=True)
+    csv_path = os.path.join(args.run_dir, 'weighted_vote_grid.csv')
+    results.to_csv(csv_path, index=False, float_format='%.6g')
+    print(f'✅ Resultados salvos: {csv_path}')
+
+    current = overall[(overall['threshold'] == CURRENT_THRESHOLD)
+                      & (overall['decay'] == CURRENT_DECAY)].iloc[0]
+    best = overall.loc[overall['f1'].idxmax()]
+    print(f'\n🎯 Atual:                 threshold={current["threshold"]:.3f}, '
+          f'decay={current["decay"]:.4g} → acurácia {current["accuracy"]:.2f}%, F1 {current["f1"]:.2f}%')
+    print(f'🏆 Melhor F1:            threshold={best["threshold"]:.3f}, '
+          f'decay={best["decay"]:.4g} → acurácia {best["accuracy"]:.2f}%, F1 {best["f1"]:.2f}%\n')
+
+    if not args.no_plot:
+        plot_surfaces(overall, thresholds, decays, args.run_dir)
+
+
+if __name__ == '__main__':
+    main()